@@ -0,0 +1,62 @@
+import sys
+import time
+
+from markdown_blocks import BlockType, classify_block
+
+
+def split_per_check_classifier(md_block):
+    if md_block.startswith("#"):
+        heading_parts = md_block.split(" ", 1)
+        if len(heading_parts) > 1 and 1 <= len(heading_parts[0]) <= 6 and all(char == "#" for char in heading_parts[0]):
+            return BlockType.HEADING, md_block.split("\n")
+    if md_block.startswith("```") and md_block.endswith("```") and len(md_block) >= 6:
+        return BlockType.CODE, md_block.split("\n")
+    if md_block.startswith(">"):
+        lines = md_block.splitlines()
+        if all(line.startswith(">") for line in lines):
+            return BlockType.QUOTE, md_block.split("\n")
+    if md_block.startswith("- "):
+        lines = md_block.splitlines()
+        if all(line.startswith("- ") for line in lines):
+            return BlockType.UNORDERED_LIST, md_block.split("\n")
+    if md_block.startswith("1. "):
+        lines = md_block.splitlines()
+        expected_number = 1
+        for line in lines:
+            if not line.startswith(f"{expected_number}. "):
+                break
+            expected_number += 1
+        else:
+            return BlockType.ORDERED_LIST, md_block.split("\n")
+    return BlockType.PARAGRAPH, md_block.split("\n")
+
+
+def list_heavy(count):
+    unordered = "\n".join(f"- item {index}" for index in range(20))
+    ordered = "\n".join(f"{index}. step {index}" for index in range(1, 21))
+    return [unordered, ordered] * count
+
+
+def quote_heavy(count):
+    quote = "\n".join(f"> quoted line {index}" for index in range(20))
+    return [quote, quote + "\nnot a quote"] * count
+
+
+def time_classifier(classifier, blocks):
+    start = time.perf_counter()
+    results = [classifier(block) for block in blocks]
+    return time.perf_counter() - start, results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    for name, blocks in (("list-heavy", list_heavy(count)), ("quote-heavy", quote_heavy(count))):
+        old_time, old_results = time_classifier(split_per_check_classifier, blocks)
+        new_time, new_results = time_classifier(classify_block, blocks)
+        if old_results != new_results:
+            raise ValueError("single-scan classifier differs from per-check classifier")
+        print(f"classify {name} ({len(blocks)} blocks): per-check splits {old_time:.3f}s, single scan {new_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
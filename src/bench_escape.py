@@ -0,0 +1,118 @@
+import gc
+import statistics
+import sys
+import time
+
+from htmlnode import LeafNode
+from markdown_blocks import markdown_to_html, markdown_to_html_node
+from textnode import TEXT_NODE_CONVERTERS, TEXT_NODE_HTML_RENDERERS, TextType
+
+PAGE = (
+    "# Handlers {index}\n\n"
+    "Call `handler(request)` when `a < b && c > d` holds, see [docs](/docs?page={index}&v=2).\n\n"
+    "```\ndef handler(request):\n    if request.size < LIMIT and request.kind != \"<none>\":\n"
+    "        return request.body & MASK\n    return None\n```\n\n"
+    "```\nfor item in items:\n    total += item.price * item.count\n```\n\n"
+    "- step with `code` one\n- step two\n"
+)
+
+
+def raw_leaf_to_html(self):
+    # Same as LeafNode.to_html, cached tags included, minus the escaping.
+    value = self.value
+    if value is None:
+        raise ValueError("invalid HTML: no value")
+    if self._tag is None:
+        return value
+    open_tag = self._open_tag
+    if open_tag is None:
+        open_tag = self.render_tags()
+    return f"{open_tag}{value}{self._close_tag}"
+
+
+RAW_TEXT_HTML_RENDERERS = {
+    TextType.TEXT: lambda node: node.text,
+    TextType.BOLD: lambda node: f"<b>{node.text}</b>",
+    TextType.ITALIC: lambda node: f"<i>{node.text}</i>",
+    TextType.CODE: lambda node: f"<code>{node.text}</code>",
+    TextType.LINK: lambda node: f'<a href="{node.url}">{node.text}</a>',
+    TextType.IMAGE: lambda node: f'<img src="{node.url}" alt="{node.text}"></img>',
+}
+
+
+RAW_TEXT_CONVERTERS = {
+    TextType.TEXT: lambda node: LeafNode(None, node.text),
+    TextType.BOLD: lambda node: LeafNode("b", node.text),
+    TextType.ITALIC: lambda node: LeafNode("i", node.text),
+    TextType.CODE: lambda node: LeafNode("code", node.text),
+    TextType.LINK: lambda node: LeafNode("a", node.text, {"href": node.url}),
+}
+
+
+def set_escaping(enabled, originals):
+    if enabled:
+        leaf_to_html, renderers, converters = originals
+    else:
+        leaf_to_html, renderers, converters = (
+            raw_leaf_to_html,
+            RAW_TEXT_HTML_RENDERERS,
+            RAW_TEXT_CONVERTERS,
+        )
+    LeafNode.to_html = leaf_to_html
+    TEXT_NODE_HTML_RENDERERS.update(renderers)
+    TEXT_NODE_CONVERTERS.update(converters)
+
+
+def time_stage(stage):
+    gc.collect()
+    start = time.perf_counter()
+    stage()
+    return time.perf_counter() - start
+
+
+def measure(stages, repeat):
+    # Each round times both variants back to back, swapping which goes first, and keeps
+    # the overhead ratio; the median ratio is far steadier than comparing two best times.
+    originals = LeafNode.to_html, dict(TEXT_NODE_HTML_RENDERERS), dict(TEXT_NODE_CONVERTERS)
+    ratios = {name: [] for name in stages}
+    best = {}
+    try:
+        for round_index in range(repeat):
+            for name, stage in stages.items():
+                times = {}
+                order = (False, True) if round_index % 2 else (True, False)
+                for enabled in order:
+                    set_escaping(enabled, originals)
+                    times[enabled] = time_stage(stage)
+                    key = (name, enabled)
+                    best[key] = min(best.get(key, times[enabled]), times[enabled])
+                ratios[name].append(times[True] / times[False])
+    finally:
+        set_escaping(True, originals)
+    return best, {name: statistics.median(values) for name, values in ratios.items()}
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    documents = [PAGE.format(index=index) for index in range(pages)]
+    trees = [markdown_to_html_node(document) for document in documents]
+
+    stages = {
+        "to_html": lambda: [tree.to_html() for tree in trees],
+        "tree_end_to_end": lambda: [markdown_to_html_node(document).to_html() for document in documents],
+        "markdown_to_html": lambda: [markdown_to_html(document) for document in documents],
+    }
+    best, ratios = measure(stages, repeat)
+
+    print(f"escape {pages} code-heavy pages, {repeat} paired rounds:")
+    for name in stages:
+        raw, escaped = best[(name, False)], best[(name, True)]
+        print(
+            f"  {name:<18} best raw {raw:.4f}s, escaped {escaped:.4f}s,"
+            f" median overhead {ratios[name] - 1:+.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import re
+import sys
+import time
+
+from inline_markdown import split_nodes_image, split_nodes_link
+from textnode import TextNode, TextType
+
+
+def findall_split_nodes(old_nodes, pattern, text_type, template):
+    new_nodes = []
+    for old_node in old_nodes:
+        if old_node.text_type != TextType.TEXT:
+            new_nodes.append(old_node)
+            continue
+        matches = re.findall(pattern, old_node.text)
+        if not matches:
+            new_nodes.append(old_node)
+            continue
+        split_text = old_node.text
+        for text, url in matches:
+            parts = split_text.split(template.format(text, url), 1)
+            if parts[0]:
+                new_nodes.append(TextNode(parts[0], TextType.TEXT))
+            new_nodes.append(TextNode(text, text_type, url))
+            split_text = parts[1] if len(parts) > 1 else ""
+        if split_text:
+            new_nodes.append(TextNode(split_text, TextType.TEXT))
+    return new_nodes
+
+
+def findall_pipeline(nodes):
+    nodes = findall_split_nodes(
+        nodes, r"!\[([^\[\]]*)\]\(([^\(\)]*)\)", TextType.IMAGE, "![{}]({})"
+    )
+    return findall_split_nodes(
+        nodes, r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)", TextType.LINK, "[{}]({})"
+    )
+
+
+def span_pipeline(nodes):
+    return split_nodes_link(split_nodes_image(nodes))
+
+
+def make_text(links):
+    return " ".join(
+        f"see [link {index}](https://example.com/{index}) and ![img](/i/{index}.png)"
+        for index in range(links)
+    )
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 50_000]
+    for count in counts:
+        nodes = [TextNode(make_text(count), TextType.TEXT)]
+        start = time.perf_counter()
+        expected = findall_pipeline(nodes)
+        findall_time = time.perf_counter() - start
+        start = time.perf_counter()
+        result = span_pipeline(nodes)
+        span_time = time.perf_counter() - start
+        if result != expected:
+            raise ValueError("span split differs from findall split")
+        print(f"links+images {count}: findall/split {findall_time:.3f}s, finditer spans {span_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
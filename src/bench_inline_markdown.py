@@ -0,0 +1,55 @@
+import sys
+import time
+
+from inline_markdown import (
+    split_nodes_delimiter,
+    split_nodes_image,
+    split_nodes_link,
+    text_to_textnodes,
+)
+from textnode import TextNode, TextType
+
+
+def chained_text_to_textnodes(text):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    for delimiter, text_type in [
+        ("**", TextType.BOLD),
+        ("_", TextType.ITALIC),
+        ("`", TextType.CODE),
+    ]:
+        nodes = split_nodes_delimiter(nodes, delimiter, text_type)
+    return nodes
+
+
+def make_text(size):
+    sentence = (
+        "This is **bold** text with an _italic_ word, a `code span`, "
+        "a [link](https://example.com/page) and an ![image](/images/a.png). "
+    )
+    return sentence * (size // len(sentence) + 1)
+
+
+def time_call(func, text):
+    start = time.perf_counter()
+    nodes = func(text)
+    return time.perf_counter() - start, nodes
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000_000, 4_000_000]
+    for size in sizes:
+        text = make_text(size)
+        chained_time, chained_nodes = time_call(chained_text_to_textnodes, text)
+        single_time, single_nodes = time_call(text_to_textnodes, text)
+        if chained_nodes != single_nodes:
+            raise ValueError("tokenizer output differs from chained pipeline")
+        megabytes = len(text) / 1_000_000
+        print(f"inline {megabytes:.1f} MB, {len(single_nodes)} nodes")
+        print(f"  chained passes: {chained_time:.3f}s ({megabytes / chained_time:.1f} MB/s)")
+        print(f"  single pass:    {single_time:.3f}s ({megabytes / single_time:.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import sys
+import time
+import tracemalloc
+
+from htmlnode import LeafNode
+from textnode import TextNode, TextType
+
+
+class DictTextNode:
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+
+class DictLeafNode:
+    def __init__(self, tag, value, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = None
+        self.props = props
+
+
+def measure(label, factory, count):
+    start = time.perf_counter()
+    nodes = [factory(index) for index in range(count)]
+    elapsed = time.perf_counter() - start
+    del nodes
+    tracemalloc.start()
+    nodes = [factory(index) for index in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    list_bytes = sys.getsizeof(nodes)
+    print(
+        f"  {label:<10} {(size - list_bytes) / count:6.1f} bytes/node, "
+        f"{elapsed / count * 1e9:6.1f} ns/node"
+    )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    text = "shared text"
+    print(f"TextNode x {count}")
+    measure("__dict__", lambda _: DictTextNode(text, TextType.BOLD), count)
+    measure("__slots__", lambda _: TextNode(text, TextType.BOLD), count)
+    print(f"LeafNode x {count}")
+    measure("__dict__", lambda _: DictLeafNode("b", text), count)
+    measure("__slots__", lambda _: LeafNode("b", text), count)
+
+
+if __name__ == "__main__":
+    main()
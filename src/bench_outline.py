@@ -0,0 +1,55 @@
+import sys
+import time
+
+from htmlnode import count_nodes
+from markdown_blocks import markdown_to_html_node, outline, word_count
+
+PAGE = (
+    "# Page {index}\n\n"
+    "Intro with **bold**, _italic_ and a [link](https://example.com/{index}).\n\n"
+    "## Details\n\n"
+    "- first item with `code`\n- second item with **emphasis**\n- third item\n\n"
+    "> a quote with a [reference](/refs/{index})\n\n"
+    "### Notes\n\n"
+    "Closing paragraph with ![an image](/images/{index}.png) and more _words_ here.\n"
+)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def eager(documents):
+    metadata = []
+    for document in documents:
+        tree = markdown_to_html_node(document)
+        count_nodes(tree)
+        metadata.append((outline(tree), word_count(tree)))
+    return metadata
+
+
+def lazy(documents):
+    metadata = []
+    for document in documents:
+        tree = markdown_to_html_node(document)
+        metadata.append((outline(tree), word_count(tree)))
+    return metadata
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    documents = [PAGE.format(index=index) for index in range(pages)]
+    eager_time, eager_metadata = timed(lambda: eager(documents))
+    lazy_time, lazy_metadata = timed(lambda: lazy(documents))
+    if eager_metadata != lazy_metadata:
+        raise ValueError("lazy outline differs from the fully parsed one")
+    print(
+        f"outline + word count for {pages} pages: "
+        f"fully parsed {eager_time:.3f}s, lazy {lazy_time:.3f}s ({eager_time / lazy_time:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
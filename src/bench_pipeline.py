@@ -0,0 +1,147 @@
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+from inline_markdown import text_to_textnodes
+from markdown_blocks import (
+    BlockType,
+    block_to_block_type,
+    markdown_to_blocks,
+    markdown_to_html,
+    markdown_to_html_node,
+)
+from textnode import text_node_to_html_node
+
+BASELINE_PATH = ".bench_baseline.json"
+REGRESSION_THRESHOLD = 1.10
+
+
+def huge_paragraph():
+    sentence = "A long paragraph line with **bold**, _italic_ and `code` spans in it.\n"
+    return [sentence * 20_000]
+
+
+def link_dense():
+    line = "See [docs](https://example.com/docs) and ![logo](/images/logo.png) here. "
+    return [(line * 40 + "\n\n") * 500]
+
+
+def long_lists():
+    unordered = "\n".join(f"- item {index} with a [link](/items/{index})" for index in range(2_000))
+    ordered = "\n".join(f"{index}. step {index} is **important**" for index in range(1, 2_001))
+    return [f"{unordered}\n\n{ordered}\n\n" * 10]
+
+
+def code_fences():
+    fence = "```\ndef handler(request):\n    return request.body\n```\n\nSome text between.\n\n"
+    return [fence * 10_000]
+
+
+def small_pages():
+    page = (
+        "# Page {index}\n\n"
+        "Intro with **bold** and a [link](https://example.com/{index}).\n\n"
+        "- one\n- two\n- three\n\n"
+        "> a short quote\n"
+    )
+    return [page.format(index=index) for index in range(5_000)]
+
+
+CORPORA = {
+    "huge_paragraph": huge_paragraph,
+    "link_dense": link_dense,
+    "long_lists": long_lists,
+    "code_fences": code_fences,
+    "small_pages": small_pages,
+}
+
+
+def stage_inputs(documents):
+    blocks = [block for document in documents for block in markdown_to_blocks(document)]
+    inline_texts = [
+        block.replace("\n", " ") for block in blocks if block_to_block_type(block) != BlockType.CODE
+    ]
+    text_nodes = [node for text in inline_texts for node in text_to_textnodes(text)]
+    trees = [markdown_to_html_node(document) for document in documents]
+    return blocks, inline_texts, text_nodes, trees
+
+
+def best_time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_corpus(documents, repeat):
+    blocks, inline_texts, text_nodes, trees = stage_inputs(documents)
+    stages = {
+        "markdown_to_blocks": lambda: [markdown_to_blocks(document) for document in documents],
+        "block_to_block_type": lambda: [block_to_block_type(block) for block in blocks],
+        "text_to_textnodes": lambda: [text_to_textnodes(text) for text in inline_texts],
+        "text_node_to_html_node": lambda: [text_node_to_html_node(node) for node in text_nodes],
+        "to_html": lambda: [tree.to_html() for tree in trees],
+        "end_to_end": lambda: [markdown_to_html_node(document).to_html() for document in documents],
+        "direct_end_to_end": lambda: [markdown_to_html(document) for document in documents],
+    }
+    results = {name: best_time(stage, repeat) for name, stage in stages.items()}
+
+    tracemalloc.start()
+    stages["end_to_end"]()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return results, peak
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("corpora", nargs="*", metavar="corpus", help=", ".join(CORPORA))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    baseline = load_baseline()
+    report = {}
+    regressions = []
+    for name in args.corpora or CORPORA:
+        if name not in CORPORA:
+            parser.error(f"unknown corpus: {name}")
+        documents = CORPORA[name]()
+        megabytes = sum(len(document.encode()) for document in documents) / 1_000_000
+        timings, peak = run_corpus(documents, args.repeat)
+        report[name] = timings
+        print(f"{name}: {megabytes:.2f} MB in {len(documents)} document(s), peak {peak / 1_000_000:.1f} MB")
+        for stage, elapsed in timings.items():
+            line = f"  {stage:<24} {elapsed:8.4f}s {megabytes / elapsed:9.2f} MB/s"
+            previous = baseline.get(name, {}).get(stage)
+            if previous:
+                ratio = elapsed / previous
+                line += f"  {ratio:5.2f}x baseline"
+                if ratio > REGRESSION_THRESHOLD:
+                    line += "  REGRESSION"
+                    regressions.append(f"{name}.{stage}")
+            print(line)
+
+    if args.save_baseline:
+        baseline.update(report)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {BASELINE_PATH}")
+    if regressions:
+        print(f"Regressions over {REGRESSION_THRESHOLD:.2f}x: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import os
+import sys
+import tempfile
+import time
+
+from render_pages import render_directory
+
+PAGE = """# Page {index}
+
+This is **bold** text with an _italic_ word, a `code span` and a [link](https://example.com/{index}).
+
+- first item with **emphasis**
+- second item with a [link](https://example.com)
+- third item
+
+> A quote that spans
+> more than one line
+
+```
+code that stays the same
+```
+"""
+
+
+def write_corpus(content_dir, pages, repeat):
+    for index in range(pages):
+        with open(os.path.join(content_dir, f"page{index}.md"), "w") as f:
+            f.write("\n\n".join(PAGE.format(index=index) for _ in range(repeat)))
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        content_dir = os.path.join(tmp, "content")
+        os.mkdir(content_dir)
+        write_corpus(content_dir, pages, 20)
+        worker_counts = [1]
+        while worker_counts[-1] * 2 < max_workers:
+            worker_counts.append(worker_counts[-1] * 2)
+        if max_workers > 1:
+            worker_counts.append(max_workers)
+        baseline = None
+        for workers in worker_counts:
+            start = time.perf_counter()
+            render_directory(content_dir, os.path.join(tmp, "public"), workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(
+                f"render {pages} pages, {workers} workers: {elapsed:.3f}s "
+                f"(speedup {baseline / elapsed:.2f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import sys
+import time
+
+from htmlnode import LeafNode, ParentNode, count_nodes
+
+
+def build_tree(paragraphs):
+    return ParentNode(
+        "div",
+        [
+            ParentNode(
+                "p",
+                [
+                    LeafNode(None, f"Paragraph {index} with "),
+                    LeafNode("a", "a link", {"href": f"https://example.com/{index}"}),
+                    LeafNode(None, " and "),
+                    LeafNode("img", "", {"src": f"/images/{index}.png", "alt": "an image"}),
+                    LeafNode("b", "bold"),
+                ],
+            )
+            for index in range(paragraphs)
+        ],
+    )
+
+
+def build_deep_tree(depth):
+    node = LeafNode("p", "innermost")
+    for level in range(depth):
+        node = ParentNode("blockquote" if level % 2 else "li", [LeafNode(None, "level"), node])
+    return node
+
+
+def recursive_chunks(node):
+    if not isinstance(node, ParentNode):
+        yield node.to_html()
+        return
+    yield f"<{node.tag}{node.props_to_html()}>"
+    for child in node.children:
+        yield from recursive_chunks(child)
+    yield f"</{node.tag}>"
+
+
+def recursive_to_html(node):
+    return "".join(recursive_chunks(node))
+
+
+def iterative_to_html(node):
+    return node.to_html()
+
+
+def best_time(func, tree, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        html = func(tree)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, html
+
+
+def compare(label, tree, repeat):
+    line = f"{label} ({count_nodes(tree)} nodes):"
+    outputs = []
+    for name, func in (("recursive", recursive_to_html), ("iterative", iterative_to_html)):
+        try:
+            elapsed, html = best_time(func, tree, repeat)
+        except RecursionError:
+            line += f" {name} RecursionError,"
+            continue
+        outputs.append(html)
+        line += f" {name} {elapsed * 1000:.2f} ms,"
+    if len(set(outputs)) > 1:
+        raise ValueError(f"{label}: recursive and iterative output differ")
+    print(line.rstrip(","))
+
+
+def main():
+    paragraphs = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    tree = build_tree(paragraphs)
+
+    start = time.perf_counter()
+    first = tree.to_html()
+    first_time = time.perf_counter() - start
+    elapsed, html = best_time(iterative_to_html, tree, repeat)
+    if html != first:
+        raise ValueError("repeated serialization differs from the first")
+    print(f"serialize {paragraphs} paragraphs: first {first_time:.3f}s, cached tags {elapsed:.3f}s")
+
+    compare("wide tree", tree, repeat)
+    compare("nested 200", build_deep_tree(200), repeat * 20)
+    compare("nested 100000", build_deep_tree(100_000), repeat)
+
+
+if __name__ == "__main__":
+    main()
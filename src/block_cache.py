@@ -0,0 +1,87 @@
+import hashlib
+import sqlite3
+from collections import OrderedDict
+
+CACHE_VERSION = "2"
+
+
+class BlockCache:
+    def __init__(self, path=None, max_entries=4096):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.pending = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path, timeout=30)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS blocks (key TEXT PRIMARY KEY, html TEXT NOT NULL)"
+            )
+
+    def key(self, block, salt=""):
+        digest = hashlib.blake2b(CACHE_VERSION.encode(), digest_size=16)
+        digest.update(salt.encode())
+        digest.update(block.encode())
+        return digest.hexdigest()
+
+    def get(self, block, salt=""):
+        key = self.key(block, salt)
+        html = self.entries.get(key)
+        if html is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return html
+        if self.db is not None:
+            row = self.db.execute("SELECT html FROM blocks WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self.disk_hits += 1
+                self.remember(key, row[0])
+                return row[0]
+        self.misses += 1
+        return None
+
+    def put(self, block, html, salt=""):
+        key = self.key(block, salt)
+        self.remember(key, html)
+        if self.db is not None:
+            self.pending[key] = html
+
+    def remember(self, key, html):
+        self.entries[key] = html
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def flush(self):
+        if self.db is None or not self.pending:
+            return
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO blocks (key, html) VALUES (?, ?)",
+                self.pending.items(),
+            )
+        self.pending = {}
+
+    def close(self):
+        self.flush()
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def counters(self):
+        return self.hits, self.disk_hits, self.misses
+
+    def stats(self):
+        return {**counter_stats(*self.counters()), "entries": len(self.entries)}
+
+
+def counter_stats(hits, disk_hits, misses):
+    lookups = hits + disk_hits + misses
+    return {
+        "hits": hits,
+        "disk_hits": disk_hits,
+        "misses": misses,
+        "hit_rate": (hits + disk_hits) / lookups if lookups else 0.0,
+    }
@@ -0,0 +1,100 @@
+import os
+import time
+
+from depgraph import DependencyGraph
+from manifest import BuildManifest
+from optimize import COMPRESSED_SUFFIXES, MINIFIERS, optimize_output
+from progress import QUIET, ProgressReporter
+from render_pages import find_markdown_files, output_path_for, render_directory
+from static_sync import sync_static
+
+MANIFEST_PATH = ".build_manifest.json"
+BLOCK_CACHE_PATH = ".block_cache.sqlite"
+GRAPH_PATH = ".build_graph.json"
+OPTIMIZE_MANIFEST_PATH = ".optimize_manifest.json"
+
+
+class BuildResult:
+    def __init__(self, pages, rendered, static, graph, seconds):
+        self.pages = pages
+        self.rendered = rendered
+        self.static = static
+        self.graph = graph
+        self.seconds = seconds
+
+    def pages_per_second(self):
+        return len(self.rendered) / self.seconds if self.seconds else 0.0
+
+    def __repr__(self):
+        return f"BuildResult(pages: {len(self.pages)}, rendered: {len(self.rendered)}, seconds: {self.seconds:.2f})"
+
+
+def build_site(
+    content_dir="content",
+    static_dir="static",
+    dest_dir="public",
+    template_path=None,
+    workers=None,
+    static_mode="copy",
+    incremental=False,
+    block_cache=False,
+    minify=False,
+    precompress=False,
+    reporter=None,
+    state_dir=".",
+):
+    reporter = reporter or ProgressReporter(QUIET)
+    sources = find_markdown_files(content_dir) if os.path.isdir(content_dir) else []
+    pages = {output_path_for(source, content_dir, dest_dir) for source in sources}
+    static = sync_static(
+        static_dir,
+        dest_dir,
+        static_mode,
+        keep=pages,
+        keep_suffixes=COMPRESSED_SUFFIXES if precompress else (),
+        reporter=reporter,
+        # Minify while copying so sync and optimize agree a minified static file is unchanged.
+        transforms=MINIFIERS if minify else None,
+    )
+
+    graph = DependencyGraph(os.path.join(state_dir, GRAPH_PATH))
+    rendered = []
+    start = time.perf_counter()
+    if pages:
+        manifest = BuildManifest(os.path.join(state_dir, MANIFEST_PATH)) if incremental else None
+        rendered = render_directory(
+            content_dir,
+            dest_dir,
+            workers,
+            manifest=manifest,
+            cache_path=os.path.join(state_dir, BLOCK_CACHE_PATH) if block_cache else None,
+            reporter=reporter,
+            template_path=template_path,
+            graph=graph,
+            static_dir=static_dir,
+        )
+        if manifest is not None:
+            manifest.prune()
+            manifest.save()
+    result = BuildResult(pages, rendered, static, graph, time.perf_counter() - start)
+    reporter.info(
+        f"Rendered {len(rendered)} of {len(pages)} pages in {result.seconds:.2f}s"
+        f" ({result.pages_per_second():.0f} pages/s)"
+    )
+    graph.prune(pages)
+    graph.save()
+
+    if minify or precompress:
+        manifest = BuildManifest(os.path.join(state_dir, OPTIMIZE_MANIFEST_PATH))
+        optimize_output(
+            dest_dir,
+            minify,
+            precompress,
+            manifest=manifest,
+            workers=workers,
+            reporter=reporter,
+        )
+        manifest.prune()
+        manifest.save()
+    reporter.summary("Build")
+    return result
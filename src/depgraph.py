@@ -0,0 +1,78 @@
+import json
+import os
+
+from inline_markdown import extract_markdown_images, extract_markdown_links
+
+EXTERNAL_PREFIXES = ("#", "//", "mailto:", "data:", "tel:")
+PAGE_EXTENSIONS = ("", ".html", ".md")
+
+
+class DependencyGraph:
+    def __init__(self, path=None):
+        self.path = path
+        self.dependencies = {}
+        self.dependents = {}
+        if path is not None and os.path.exists(path):
+            with open(path) as f:
+                for output, inputs in json.load(f).items():
+                    self.set_dependencies(output, inputs)
+
+    def set_dependencies(self, output, inputs):
+        self.remove(output)
+        inputs = sorted({os.path.normpath(input_path) for input_path in inputs})
+        self.dependencies[output] = inputs
+        for input_path in inputs:
+            self.dependents.setdefault(input_path, set()).add(output)
+
+    def remove(self, output):
+        for input_path in self.dependencies.pop(output, []):
+            outputs = self.dependents.get(input_path)
+            if outputs is not None:
+                outputs.discard(output)
+                if not outputs:
+                    del self.dependents[input_path]
+
+    def prune(self, outputs):
+        for output in list(self.dependencies):
+            if output not in outputs:
+                self.remove(output)
+
+    def affected_outputs(self, changed_files):
+        affected = set()
+        pending = [os.path.normpath(path) for path in changed_files]
+        while pending:
+            path = pending.pop()
+            for output in self.dependents.get(path, ()):
+                if output not in affected:
+                    affected.add(output)
+                    pending.append(os.path.normpath(output))
+        return affected
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.dependencies, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def referenced_assets(blocks, page_dir, static_dir):
+    assets = set()
+    for block in blocks:
+        for _, url in extract_markdown_images(block) + extract_markdown_links(block):
+            asset = local_asset_path(url, page_dir, static_dir)
+            if asset is not None:
+                assets.add(asset)
+    return sorted(assets)
+
+
+def local_asset_path(url, page_dir, static_dir):
+    if "://" in url or url.startswith(EXTERNAL_PREFIXES):
+        return None
+    url = url.split("#", 1)[0].split("?", 1)[0]
+    if url.startswith("/"):
+        relative_path = os.path.normpath(url.lstrip("/"))
+    else:
+        relative_path = os.path.normpath(os.path.join(page_dir, url))
+    if relative_path.startswith("..") or os.path.splitext(relative_path)[1] in PAGE_EXTENSIONS:
+        return None
+    return os.path.join(static_dir, relative_path)
@@ -1,53 +1,229 @@
+import copy
+from types import MappingProxyType
+
+from profiling import output_length, profiled
+
+
+class SafeHTML(str):
+    __slots__ = ()
+
+
+def escape_text(text):
+    if text.__class__ is not str:
+        text = str(text)
+    if "&" in text or "<" in text or ">" in text:
+        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text
+
+
+def escape_attribute(value):
+    if value.__class__ is not str:
+        value = str(value)
+    if "&" in value or "<" in value or ">" in value or '"' in value:
+        return (
+            value.replace("&", "&amp;")
+            .replace("<", "&lt;")
+            .replace(">", "&gt;")
+            .replace('"', "&quot;")
+        )
+    return value
+
+
 class HTMLNode:
+    __slots__ = ("_tag", "value", "children", "_props", "_open_tag", "_close_tag")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
-        self.tag = tag
+        self._tag = tag
         self.value = value
         self.children = children
-        self.props = props
+        self._props = dict(props) if props is not None else None
+        self._open_tag = None
+
+    @property
+    def tag(self):
+        return self._tag
+
+    @tag.setter
+    def tag(self, tag):
+        self._tag = tag
+        self._open_tag = None
+
+    @property
+    def props(self):
+        # Read-only view: props must be reassigned so the cached open tag is rebuilt.
+        return MappingProxyType(self._props) if self._props is not None else None
+
+    @props.setter
+    def props(self, props):
+        self._props = dict(props) if props is not None else None
+        self._open_tag = None
+
+    def render_tags(self):
+        self._open_tag = f"<{self._tag}{self.props_to_html()}>"
+        self._close_tag = f"</{self._tag}>"
+        return self._open_tag
 
     def to_html(self):
         raise NotImplementedError("to_html method not implemented")
 
+    def html_chunks(self):
+        yield self.to_html()
+
     def props_to_html(self):
-        if self.props is None:
+        if self._props is None:
             return ""
         props_html = ""
-        for prop in self.props:
-            props_html += f' {prop}="{self.props[prop]}"'
+        for prop in self._props:
+            props_html += f' {prop}="{escape_attribute(self._props[prop])}"'
         return props_html
 
     def __repr__(self):
-        return f"HTMLNode({self.tag}, {self.value}, children: {self.children}, {self.props})"
+        return f"HTMLNode({self._tag}, {self.value}, children: {self.children}, {self._props})"
 
 
 class LeafNode(HTMLNode):
+    __slots__ = ("_escaped",)
+
     def __init__(self, tag, value, props=None):
-        super().__init__(tag, value, None, props)
+        # Assigned inline rather than through super().__init__: leaves are built per text node.
+        self._tag = tag
+        self.value = value
+        self.children = None
+        self._props = dict(props) if props is not None else None
+        self._open_tag = None
+        self._escaped = None
 
     def to_html(self):
-        if self.value is None:
+        value = self.value
+        if value is None:
             raise ValueError("invalid HTML: no value")
-        if self.tag is None:
-            return self.value
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+        if value.__class__ is not SafeHTML:
+            # value keeps the raw text for tree consumers; the escaped form is cached next to
+            # the tags and reused for as long as value is the same object.
+            escaped = self._escaped
+            if escaped is not None and escaped[0] is value:
+                value = escaped[1]
+            else:
+                self._escaped = (value, escape_text(value))
+                value = self._escaped[1]
+        if self._tag is None:
+            return value
+        open_tag = self._open_tag
+        if open_tag is None:
+            open_tag = self.render_tags()
+        return f"{open_tag}{value}{self._close_tag}"
 
     def __repr__(self):
-        return f"LeafNode({self.tag}, {self.value}, {self.props})"
+        return f"LeafNode({self._tag}, {self.value}, {self._props})"
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag, None, children, props)
 
+    @profiled("serialize", output_length)
     def to_html(self):
-        if self.tag is None:
-            raise ValueError("invalid HTML: no tag")
-        if self.children is None:
-            raise ValueError("invalid HTML: no children")
-        children_html = ""
-        for child in self.children:
-            children_html += child.to_html()
-        return f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
+        return "".join(iter_html(self))
+
+    def html_chunks(self):
+        return iter_html(self)
+
+    def __repr__(self):
+        return f"ParentNode({self._tag}, children: {self.children}, {self._props})"
+
+
+class LazyParentNode(ParentNode):
+    __slots__ = ("text", "parse", "_children")
+
+    def __init__(self, tag, text, parse, props=None):
+        self.text = text
+        self.parse = parse
+        super().__init__(tag, None, props)
+
+    @property
+    def children(self):
+        children = self._children
+        if children is None:
+            children = self._children = self.parse(self.text)
+        return children
+
+    @children.setter
+    def children(self, children):
+        self._children = children
+
+    def is_parsed(self):
+        return self._children is not None
 
     def __repr__(self):
-        return f"ParentNode({self.tag}, children: {self.children}, {self.props})"
\ No newline at end of file
+        if not self.is_parsed():
+            return f"LazyParentNode({self._tag}, text: {self.text!r}, {self._props})"
+        return super().__repr__()
+
+
+def walk(root):
+    stack = [(root, True)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node, entering = pop()
+        yield node, entering
+        if entering and node.children is not None:
+            push((node, False))
+            stack.extend([(child, True) for child in reversed(node.children)])
+
+
+def iter_html(root):
+    # Closing tags go on the same stack as nodes, so nesting depth never touches the Python stack.
+    stack = [root]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node = pop()
+        if node.__class__ is str:
+            yield node
+        elif isinstance(node, ParentNode):
+            if node._tag is None:
+                raise ValueError("invalid HTML: no tag")
+            children = node.children
+            if children is None:
+                raise ValueError("invalid HTML: no children")
+            open_tag = node._open_tag
+            if open_tag is None:
+                open_tag = node.render_tags()
+            yield open_tag
+            push(node._close_tag)
+            stack.extend(reversed(children))
+        else:
+            yield node.to_html()
+
+
+def count_nodes(root):
+    return sum(1 for _, entering in walk(root) if entering)
+
+
+def transform_tree(root, visit):
+    # Post-order: visit(node) returns the node to keep, a replacement, or None to drop it.
+    # Parents whose children changed are shallow-copied, so the input tree is never modified.
+    results = [[]]
+    for node, entering in walk(root):
+        if node.children is not None:
+            if entering:
+                results.append([])
+                continue
+            children = results.pop()
+            if len(children) != len(node.children) or any(
+                new is not old for new, old in zip(children, node.children)
+            ):
+                node = copy.copy(node)
+                node.children = children
+        replacement = visit(node)
+        if replacement is not None:
+            results[-1].append(replacement)
+    return results[0][0] if results[0] else None
+
+
+@profiled("serialize")
+def write_html(node, fp):
+    fp.writelines(node.html_chunks())
@@ -1,5 +1,6 @@
 import re
 
+from profiling import input_length, profiled
 from textnode import TextNode, TextType, text_node_to_html_node
 
 
@@ -24,93 +25,103 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
     return new_nodes
 
 
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+INLINE_TOKEN_PATTERN = re.compile(LINK_PATTERN.pattern + r"|\*\*|_|`")
+
+
 def extract_markdown_images(text):
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return IMAGE_PATTERN.findall(text)
 
 
 def extract_markdown_links(text):
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return LINK_PATTERN.findall(text)
 
 
 def split_nodes_image(old_nodes):
-    new_nodes = []
-    for old_node in old_nodes:
-        if old_node.text_type != TextType.TEXT:
-            new_nodes.append(old_node)
-            continue
-
-        images = extract_markdown_images(old_node.text)
-
-        if not images:
-            new_nodes.append(old_node)
-            continue
-
-        split_text = old_node.text
-        for image_alt, image_url in images:
-            parts = split_text.split(f"![{image_alt}]({image_url})", 1)
-
-            if parts[0]:
-                new_nodes.append(TextNode(parts[0], TextType.TEXT))
+    return split_nodes_pattern(old_nodes, IMAGE_PATTERN, TextType.IMAGE)
 
-            new_nodes.append(TextNode(image_alt, TextType.IMAGE, image_url))
 
-            split_text = parts[1] if len(parts) > 1 else ""
-        
-        if split_text:
-            new_nodes.append(TextNode(split_text, TextType.TEXT))
-        
-    return new_nodes            
+def split_nodes_link(old_nodes):
+    return split_nodes_pattern(old_nodes, LINK_PATTERN, TextType.LINK)
 
 
-def split_nodes_link(old_nodes):
+def split_nodes_pattern(old_nodes, pattern, text_type):
     new_nodes = []
     for old_node in old_nodes:
         if old_node.text_type != TextType.TEXT:
             new_nodes.append(old_node)
             continue
 
-        links = extract_markdown_links(old_node.text)
+        text = old_node.text
+        start = 0
+        for match in pattern.finditer(text):
+            if start < match.start():
+                new_nodes.append(TextNode(text[start : match.start()], TextType.TEXT))
+            new_nodes.append(TextNode(match.group(1), text_type, match.group(2)))
+            start = match.end()
 
-        if not links:
+        if start == 0:
             new_nodes.append(old_node)
-            continue
-
-        split_text = old_node.text
-        for link_alt, link_url in links:
-            parts = split_text.split(f"[{link_alt}]({link_url})", 1)
-
-            if parts[0]:
-                new_nodes.append(TextNode(parts[0], TextType.TEXT))
-
-            new_nodes.append(TextNode(link_alt, TextType.LINK, link_url))
+        elif start < len(text):
+            new_nodes.append(TextNode(text[start:], TextType.TEXT))
 
-            split_text = parts[1] if len(parts) > 1 else ""
-        
-        if split_text:
-            new_nodes.append(TextNode(split_text, TextType.TEXT))
-        
     return new_nodes
 
 
+@profiled("inline_parse", input_length)
 def text_to_textnodes(text):
-    nodes = [TextNode(text, TextType.TEXT)]
-
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-
-    delimiter_types=[
-        ("**", TextType.BOLD),
-        ("_", TextType.ITALIC),
-        ("`", TextType.CODE)
-    ]
-    
-    for delimiter, text_type in delimiter_types:
-        nodes = split_nodes_delimiter(nodes, delimiter, text_type)
-    
+    # Images win over everything else, like the old split_nodes_image pass,
+    # so they are located first and the gaps between them are tokenized once.
+    nodes = []
+    start = 0
+    for match in IMAGE_PATTERN.finditer(text):
+        tokenize_inline(text, start, match.start(), nodes)
+        nodes.append(TextNode(match.group(1), TextType.IMAGE, match.group(2)))
+        start = match.end()
+    tokenize_inline(text, start, len(text), nodes)
     return nodes
 
 
+def tokenize_inline(text, start, end, nodes):
+    # Delimiters nest by priority: inside bold everything is literal, inside
+    # italic backticks are literal. A link ends the run, so nothing may be open.
+    section_start = start
+    open_type = None
+    for match in INLINE_TOKEN_PATTERN.finditer(text, start, end):
+        token = match.group(0)
+        if token == "**":
+            delimiter_type = TextType.BOLD
+        elif token == "_":
+            if open_type == TextType.BOLD:
+                continue
+            delimiter_type = TextType.ITALIC
+        elif token == "`":
+            if open_type == TextType.BOLD or open_type == TextType.ITALIC:
+                continue
+            delimiter_type = TextType.CODE
+        else:
+            if open_type is not None:
+                raise ValueError("invalid markdown, formatted section not closed")
+            if section_start < match.start():
+                nodes.append(TextNode(text[section_start : match.start()], TextType.TEXT))
+            nodes.append(TextNode(match.group(1), TextType.LINK, match.group(2)))
+            section_start = match.end()
+            continue
+
+        if open_type is None:
+            if section_start < match.start():
+                nodes.append(TextNode(text[section_start : match.start()], TextType.TEXT))
+            open_type = delimiter_type
+        elif open_type == delimiter_type:
+            if section_start < match.start():
+                nodes.append(TextNode(text[section_start : match.start()], open_type))
+            open_type = None
+        else:
+            raise ValueError("invalid markdown, formatted section not closed")
+        section_start = match.end()
+
+    if open_type is not None:
+        raise ValueError("invalid markdown, formatted section not closed")
+    if section_start < end:
+        nodes.append(TextNode(text[section_start:end], TextType.TEXT))
@@ -1,30 +1,58 @@
+import argparse
 import os
-import shutil
 
-from textnode import TextNode, TextType
+from build import build_site
+from progress import INFO, QUIET, VERBOSE, ProgressReporter
+from profiling import ENABLED as PROFILING_ENABLED, profiler
+from serve import serve
+from static_sync import SYNC_MODES
 
 
 def main():
-    node = TextNode("This is a text node", TextType.BOLD, "https://www.boot.dev")
-    print(node)
-    copy_static_directory("static", "public")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", nargs="?", choices=("build", "serve"), default="build")
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--static-mode", choices=SYNC_MODES, default="copy")
+    parser.add_argument("--block-cache", action="store_true")
+    parser.add_argument("--minify", action="store_true")
+    parser.add_argument("--precompress", action="store_true")
+    parser.add_argument("--watch", action="store_true")
+    parser.add_argument("--poll", action="store_true")
+    parser.add_argument("--port", type=int, default=8888)
+    parser.add_argument("--template", default="template.html")
+    parser.add_argument("-q", "--quiet", action="store_true")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
 
-def copy_static_directory(source_dir, dest_dir):
-    if os.path.exists(dest_dir):
-        shutil.rmtree(dest_dir)
-    os.mkdir(dest_dir)
-    
-    for item in os.listdir(source_dir):
-        source_path = os.path.join(source_dir, item)
-        dest_path = os.path.join(dest_dir, item)
-        if os.path.isfile(source_path):
-            shutil.copy(source_path, dest_path)
-            print(f"Copied file: {source_path} to {dest_path}")
-        else:
-            os.mkdir(dest_path)
-            print(f"Created directory: {dest_path}")
-            copy_static_directory(source_path, dest_path)
-            print(f"Finished copying directory: {source_path}")
+    if not os.path.isfile(args.template):
+        args.template = None
+    result = build(args)
+    if PROFILING_ENABLED:
+        print(profiler.summary())
+        profiler.write_trace()
+    if args.command == "serve":
+        serve(
+            "public",
+            args.port,
+            args.watch,
+            polling=args.poll,
+            template_path=args.template,
+            graph=result.graph,
+        )
 
+def build(args):
+    level = QUIET if args.quiet else VERBOSE if args.verbose else INFO
+    return build_site(
+        template_path=args.template,
+        workers=args.workers,
+        static_mode=args.static_mode,
+        incremental=args.incremental,
+        block_cache=args.block_cache,
+        minify=args.minify,
+        precompress=args.precompress,
+        reporter=ProgressReporter(level),
+    )
 
-main()
\ No newline at end of file
+
+main()
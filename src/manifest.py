@@ -0,0 +1,70 @@
+import hashlib
+import json
+import os
+
+
+class BuildManifest:
+    def __init__(self, path):
+        self.path = path
+        self.files = {}
+        self.outputs = {}
+        self.seen_outputs = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            self.files = data.get("files", {})
+            self.outputs = data.get("outputs", {})
+
+    def file_hash(self, path):
+        stat = os.stat(path)
+        cached = self.files.get(path)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        digest = hash_file(path)
+        self.files[path] = [stat.st_mtime_ns, stat.st_size, digest]
+        return digest
+
+    def is_stale(self, output, inputs):
+        self.seen_outputs.add(output)
+        recorded = self.outputs.get(output)
+        if recorded is None or not os.path.exists(output):
+            return True
+        if len(recorded) != len(inputs):
+            return True
+        for input_path in inputs:
+            if not os.path.exists(input_path):
+                return True
+            if recorded.get(input_path) != self.file_hash(input_path):
+                return True
+        return False
+
+    def record(self, output, inputs):
+        self.seen_outputs.add(output)
+        self.outputs[output] = {
+            input_path: self.file_hash(input_path) for input_path in inputs
+        }
+
+    def prune(self):
+        removed = []
+        for output in list(self.outputs):
+            if output not in self.seen_outputs:
+                del self.outputs[output]
+                removed.append(output)
+        for path in list(self.files):
+            if not os.path.exists(path):
+                del self.files[path]
+        return removed
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"files": self.files, "outputs": self.outputs}, f)
+        os.replace(tmp_path, self.path)
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -1,8 +1,21 @@
+import hashlib
+import mmap
+import os
+import re
+import sys
 from enum import Enum
 
-from htmlnode import ParentNode
-from inline_markdown import text_to_textnodes
-from textnode import text_node_to_html_node, TextNode, TextType
+from htmlnode import LazyParentNode, LeafNode, ParentNode, SafeHTML
+from inline_markdown import IMAGE_PATTERN, LINK_PATTERN, text_to_textnodes
+from profiling import file_size, input_length, output_length, profiled, profiled_iter
+from textnode import (
+    TEXT_NODE_CONVERTERS,
+    TEXT_NODE_HTML_RENDERERS,
+    text_node_to_html,
+    text_node_to_html_node,
+    TextNode,
+    TextType,
+)
 
 class BlockType(Enum):
     PARAGRAPH = "paragraph"
@@ -13,80 +26,224 @@ class BlockType(Enum):
     ORDERED_LIST = "ordered_list"
 
 
+@profiled("split_blocks", input_length)
 def markdown_to_blocks(markdown):
-    blocks = markdown.split("\n\n")
-    filtered_blocks = []
-    for block in blocks:
-        if block == "":
+    return list(iter_blocks(markdown.split("\n")))
+
+
+def iter_blocks(lines):
+    block_lines = []
+    in_fence = False
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        line = line.rstrip("\r\n")
+        stripped = line.strip()
+        if stripped.startswith("```") and (in_fence or not closes_fence(stripped, "```")):
+            in_fence = not in_fence
+        elif not in_fence and not stripped:
+            if block_lines:
+                block = "\n".join(block_lines).strip()
+                block_lines = []
+                if block:
+                    yield block
             continue
-        block = block.strip()
-        filtered_blocks.append(block)
-    return filtered_blocks
+        block_lines.append(line)
+    if block_lines:
+        block = "\n".join(block_lines).strip()
+        if block:
+            yield block
+
+
+def closes_fence(line, fence):
+    # A line like ```x = 1``` opens and closes on itself, so it must not toggle the fence.
+    return len(line) >= 2 * len(fence) and line.endswith(fence)
+
+
+MMAP_THRESHOLD = 1 << 16
+
+
+@profiled_iter("split_blocks", file_size)
+def iter_file_blocks(path):
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        if size < MMAP_THRESHOLD:
+            yield from iter_buffer_blocks(f.read())
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield from iter_buffer_blocks(buffer)
+
+
+def iter_buffer_blocks(buffer):
+    # Only line boundaries are tracked as offsets; each block is decoded once, on its own.
+    size = len(buffer)
+    position = 0
+    block_start = None
+    in_fence = False
+    while position < size:
+        line_end = buffer.find(b"\n", position)
+        if line_end == -1:
+            line_end = size
+        line = strip_line(buffer[position:line_end])
+        if line.startswith(b"```") and (in_fence or not closes_fence(line, b"```")):
+            in_fence = not in_fence
+        elif not in_fence and not line:
+            if block_start is not None:
+                block = decode_block(buffer[block_start:position])
+                block_start = None
+                if block:
+                    yield block
+            position = line_end + 1
+            continue
+        if block_start is None:
+            block_start = position
+        position = line_end + 1
+    if block_start is not None:
+        block = decode_block(buffer[block_start:size])
+        if block:
+            yield block
+
+
+def strip_line(line):
+    # bytes.strip() only knows ASCII whitespace; when a line may start or end with other
+    # whitespace, strip it as str so blank lines match iter_blocks exactly.
+    line = line.strip()
+    if line and (line[0] >= 0x80 or 0x1c <= line[0] <= 0x1f or line[-1] >= 0x80 or 0x1c <= line[-1] <= 0x1f):
+        line = line.decode("utf-8").strip().encode("utf-8")
+    return line
+
+
+def decode_block(data):
+    block = data.decode("utf-8")
+    if "\r" in block:
+        block = "\n".join(line.rstrip("\r") for line in block.split("\n"))
+    return block.strip()
 
 
+ORDERED_PREFIXES = [f"{number}. " for number in range(1, 101)]
+# Line boundaries str.splitlines() honours besides "\n"; blocks holding none of them split the same way.
+OTHER_LINE_BREAK_PATTERN = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
 def block_to_block_type(md_block):
-    if md_block.startswith("#"):
+    return classify_block(md_block)[0]
+
+@profiled("classify_blocks", input_length)
+def classify_block(md_block):
+    lines = md_block.split("\n")
+    for matcher, block_type in BLOCK_MATCHERS:
+        if matcher(md_block):
+            return block_type, lines
+
+    first_char = md_block[:1]
+    if first_char == "#":
         heading_parts = md_block.split(" ", 1)
-        if len(heading_parts) > 1 and 1 <= len(heading_parts[0]) <= 6 and all(char == "#" for char in heading_parts[0]):
-            return BlockType.HEADING
-        
-    if md_block.startswith("```") and md_block.endswith("```") and len(md_block) >= 6:
-        return BlockType.CODE
-        
-    if md_block.startswith(">"):
-        lines = md_block.splitlines()
-        if all(line.startswith(">") for line in lines):
-            return BlockType.QUOTE
-        
-    if md_block.startswith("- "):
-        lines = md_block.splitlines()
-        if all(line.startswith("- ") for line in lines):
-            return BlockType.UNORDERED_LIST
-        
-    if md_block.startswith("1. "):
-        lines = md_block.splitlines()
-        expected_number = 1
-        for line in lines:
-            expected_prefix = f"{expected_number}. "
-            if not line.startswith(expected_prefix):
-                break
-            expected_number += 1
-        else:
-            return BlockType.ORDERED_LIST
-        
-    return BlockType.PARAGRAPH
+        if len(heading_parts) > 1 and 1 <= len(heading_parts[0]) <= 6 and heading_parts[0].count("#") == len(heading_parts[0]):
+            return BlockType.HEADING, lines
+
+    if first_char == "`" and md_block.startswith("```") and md_block.endswith("```") and len(md_block) >= 6:
+        return BlockType.CODE, lines
+
+    if first_char == ">":
+        if lines_start_with(md_block, lines, ">"):
+            return BlockType.QUOTE, lines
+        return BlockType.PARAGRAPH, lines
+
+    if first_char == "-" and md_block.startswith("- "):
+        if lines_start_with(md_block, lines, "- "):
+            return BlockType.UNORDERED_LIST, lines
+        return BlockType.PARAGRAPH, lines
+
+    if first_char == "1" and md_block.startswith("1. "):
+        # Classification has always split on every splitlines() boundary; conversion on "\n" only.
+        marked = lines if OTHER_LINE_BREAK_PATTERN.search(md_block) is None else md_block.splitlines()
+        while len(ORDERED_PREFIXES) < len(marked):
+            ORDERED_PREFIXES.append(f"{len(ORDERED_PREFIXES) + 1}. ")
+        for line, prefix in zip(marked, ORDERED_PREFIXES):
+            if not line.startswith(prefix):
+                return BlockType.PARAGRAPH, lines
+        return BlockType.ORDERED_LIST, lines
 
-def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
+    return BlockType.PARAGRAPH, lines
+
+def lines_start_with(md_block, lines, marker):
+    # Every line starts with the marker exactly when every newline is followed by it.
+    if OTHER_LINE_BREAK_PATTERN.search(md_block) is None:
+        return md_block.count("\n" + marker) == len(lines) - 1
+    return all(line.startswith(marker) for line in md_block.splitlines())
+
+def markdown_to_html_node(markdown, cache=None):
+    if isinstance(markdown, str):
+        blocks = markdown_to_blocks(markdown)
+    else:
+        blocks = iter_blocks(markdown)
     children = []
+    salt = converter_fingerprint() if cache is not None else ""
     for block in blocks:
-        html_node = block_to_html_node(block)
-        children.append(html_node)
+        if cache is None:
+            children.append(block_to_html_node(block))
+        else:
+            children.append(LeafNode(None, SafeHTML(cached_block_html(block, cache, salt))))
     return ParentNode("div", children, None)
 
-def block_to_html_node(block):        
-    block_type = block_to_block_type(block)
-    if block_type == BlockType.PARAGRAPH:
-        return paragraph_to_html_node(block)
-    elif block_type == BlockType.HEADING:
-        return heading_to_html_node(block)
-    elif block_type == BlockType.CODE:
-        return code_to_html_node(block)
-    elif block_type == BlockType.QUOTE:
-        return quote_to_html_node(block)
-    elif block_type == BlockType.UNORDERED_LIST:
-        return unordered_list_to_html_node(block)
-    elif block_type == BlockType.ORDERED_LIST:
-        return ordered_list_to_html_node(block)
-    return ParentNode("div", children)
-
-def paragraph_to_html_node(block):
-    lines = block.split("\n")
+def cached_block_html(block, cache, salt=""):
+    html = cache.get(block, salt)
+    if html is None:
+        html = block_to_html(block)
+        cache.put(block, html, salt)
+    return html
+
+def converter_fingerprint():
+    # Cached HTML is only valid for the converters that produced it, so they join the cache key.
+    tables = (TEXT_NODE_CONVERTERS, TEXT_NODE_HTML_RENDERERS, BLOCK_CONVERTERS, BLOCK_HTML_RENDERERS)
+    entries = (*(tuple(table.items()) for table in tables), tuple(BLOCK_MATCHERS))
+    if entries != FINGERPRINT_MEMO[0]:
+        names = [f"{key}={callable_name(function)}" for table in entries[:4] for key, function in table]
+        names.extend(f"{block_type}~{callable_name(matcher)}" for matcher, block_type in entries[4])
+        digest = hashlib.blake2b("\n".join(sorted(names)).encode(), digest_size=8).hexdigest()
+        FINGERPRINT_MEMO[:] = [entries, digest]
+    return FINGERPRINT_MEMO[1]
+
+def callable_name(function):
+    name = f"{getattr(function, '__module__', '')}.{getattr(function, '__qualname__', type(function).__qualname__)}"
+    code = getattr(function, "__code__", None)
+    return name if code is None else f"{name}:{code.co_firstlineno}"
+
+def write_markdown_html(lines, fp, cache=None):
+    write_blocks_html(iter_blocks(lines), fp, cache)
+
+def write_blocks_html(blocks, fp, cache=None):
+    salt = converter_fingerprint() if cache is not None else ""
+    fp.write("<div>")
+    for block in blocks:
+        if cache is None:
+            fp.write(block_to_html(block))
+        else:
+            fp.write(cached_block_html(block, cache, salt))
+    fp.write("</div>")
+
+def block_to_html_node(block):
+    block_type, lines = classify_block(block)
+    converter = BLOCK_CONVERTERS.get(block_type)
+    if converter is None:
+        raise ValueError(f"invalid block type: {block_type}")
+    if converter in LINE_CONVERTERS:
+        return converter(block, lines)
+    return converter(block)
+
+def paragraph_to_html_node(block, lines=None):
+    if lines is None:
+        lines = block.split("\n")
     paragraph = " ".join(lines)
-    children = text_to_children(paragraph)
-    return ParentNode("p", children)
+    return LazyParentNode("p", paragraph, text_to_children)
+
+def heading_to_html_node(block, lines=None):
+    level = heading_level(block)
+    text = block[level + 1 :]
+    return LazyParentNode(HEADING_TAG_NAMES[level], text, text_to_children)
 
-def heading_to_html_node(block):
+def heading_level(block):
     level = 0
     for char in block:
         if char == "#":
@@ -95,46 +252,47 @@ def heading_to_html_node(block):
             break
     if level + 1 >= len(block):
         raise ValueError(f"invalid heading level: {level}")
-    text = block[level + 1 :]
-    children = text_to_children(text)
-    return ParentNode(f"h{level}", children)
+    return level
 
-def code_to_html_node(block):
-    if not block.startswith("```") or not block.endswith("```"):
-        raise ValueError("invalid code block")
-    text = block[4:-3]
+def code_to_html_node(block, lines=None):
+    text = code_text(block)
     raw_text_node = TextNode(text, TextType.TEXT)
     child = text_node_to_html_node(raw_text_node)
     code = ParentNode("code", [child])
     return ParentNode("pre", [code])
 
-def quote_to_html_node(block):
-    lines = block.split("\n")
+def code_text(block):
+    if not block.startswith("```") or not block.endswith("```"):
+        raise ValueError("invalid code block")
+    return block[4:-3]
+
+def quote_to_html_node(block, lines=None):
+    if lines is None:
+        lines = block.split("\n")
+    return LazyParentNode("blockquote", quote_text(lines), text_to_children)
+
+def quote_text(lines):
     new_lines = []
     for line in lines:
         if not line.startswith(">"):
             raise ValueError("invalid quote block")
         new_lines.append(line.lstrip(">").strip())
-    content = " ".join(new_lines)
-    children = text_to_children(content)
-    return ParentNode("blockquote", children)
+    return " ".join(new_lines)
 
-def unordered_list_to_html_node(block):
-    items = block.split("\n")
+def unordered_list_to_html_node(block, items=None):
+    if items is None:
+        items = block.split("\n")
     html_items = []
     for item in items:
-        text = item[2:]
-        children = text_to_children(text)
-        html_items.append(ParentNode("li", children))
+        html_items.append(LazyParentNode("li", item[2:], text_to_children))
     return ParentNode("ul", html_items)
 
-def ordered_list_to_html_node(block):
-    items = block.split("\n")
+def ordered_list_to_html_node(block, items=None):
+    if items is None:
+        items = block.split("\n")
     html_items = []
     for item in items:
-        text = item[3:]
-        children = text_to_children(text)
-        html_items.append(ParentNode("li", children))
+        html_items.append(LazyParentNode("li", item[3:], text_to_children))
     return ParentNode("ol", html_items)
 
 def text_to_children(text):
@@ -145,4 +303,122 @@ def text_to_children(text):
     for text_node in text_nodes:
         html_node = text_node_to_html_node(text_node)
         html_nodes.append(html_node)
-    return html_nodes
\ No newline at end of file
+    return html_nodes
+
+def outline(node):
+    headings = []
+    for child in node.children:
+        tag = child.tag
+        if isinstance(child, LazyParentNode) and tag in HEADING_TAGS:
+            headings.append((HEADING_TAGS[tag], child.text))
+    return headings
+
+# Interned once so heading nodes share tag strings with the literal tags used elsewhere.
+HEADING_TAG_NAMES = [sys.intern(f"h{level}") for level in range(7)]
+HEADING_TAGS = {HEADING_TAG_NAMES[level]: level for level in range(1, 7)}
+
+def word_count(node):
+    words = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, LazyParentNode):
+            words += count_words(node.text)
+        elif node.children is not None:
+            stack.extend(node.children)
+        elif node.value:
+            words += len(node.value.split())
+    return words
+
+def count_words(text):
+    # Match what the parsed leaves would hold: images drop out, links keep only their text.
+    if "](" in text:
+        text = IMAGE_PATTERN.sub(" ", text)
+        text = LINK_PATTERN.sub(r" \1 ", text)
+    return len(text.split())
+
+def title_from_blocks(blocks):
+    for block in blocks:
+        if block.startswith("# "):
+            return block[2:].split("\n", 1)[0].strip()
+    raise ValueError("invalid markdown: no h1 header")
+
+def markdown_to_html(markdown, cache=None):
+    if isinstance(markdown, str):
+        blocks = markdown_to_blocks(markdown)
+    else:
+        blocks = iter_blocks(markdown)
+    return blocks_to_html(blocks, cache)
+
+def blocks_to_html(blocks, cache=None):
+    if cache is None:
+        return "<div>" + "".join(map(block_to_html, blocks)) + "</div>"
+    salt = converter_fingerprint()
+    return "<div>" + "".join(cached_block_html(block, cache, salt) for block in blocks) + "</div>"
+
+# Same stage as ParentNode.to_html, so profiled builds on the direct path still report it.
+@profiled("serialize", output_length)
+def block_to_html(block):
+    block_type, lines = classify_block(block)
+    renderer = BLOCK_HTML_RENDERERS.get(block_type)
+    if renderer is not None:
+        return renderer(block, lines)
+    converter = BLOCK_CONVERTERS.get(block_type)
+    if converter is None:
+        raise ValueError(f"invalid block type: {block_type}")
+    if converter in LINE_CONVERTERS:
+        return converter(block, lines).to_html()
+    return converter(block).to_html()
+
+def paragraph_to_html(block, lines):
+    return "<p>" + text_to_html(" ".join(lines)) + "</p>"
+
+def heading_to_html(block, lines):
+    level = heading_level(block)
+    return f"<h{level}>{text_to_html(block[level + 1 :])}</h{level}>"
+
+def code_to_html(block, lines):
+    return "<pre><code>" + text_node_to_html(TextNode(code_text(block), TextType.TEXT)) + "</code></pre>"
+
+def quote_to_html(block, lines):
+    return "<blockquote>" + text_to_html(quote_text(lines)) + "</blockquote>"
+
+def unordered_list_to_html(block, items):
+    return "<ul>" + "".join("<li>" + text_to_html(item[2:]) + "</li>" for item in items) + "</ul>"
+
+def ordered_list_to_html(block, items):
+    return "<ol>" + "".join("<li>" + text_to_html(item[3:]) + "</li>" for item in items) + "</ol>"
+
+def text_to_html(text):
+    if not text.strip():
+        return ""
+    return "".join(map(text_node_to_html, text_to_textnodes(text)))
+
+
+BLOCK_CONVERTERS = {
+    BlockType.PARAGRAPH: paragraph_to_html_node,
+    BlockType.HEADING: heading_to_html_node,
+    BlockType.CODE: code_to_html_node,
+    BlockType.QUOTE: quote_to_html_node,
+    BlockType.UNORDERED_LIST: unordered_list_to_html_node,
+    BlockType.ORDERED_LIST: ordered_list_to_html_node,
+}
+# Built-in converters reuse the lines from classify_block; registered ones take just the block.
+LINE_CONVERTERS = set(BLOCK_CONVERTERS.values())
+BLOCK_HTML_RENDERERS = {
+    BlockType.PARAGRAPH: paragraph_to_html,
+    BlockType.HEADING: heading_to_html,
+    BlockType.CODE: code_to_html,
+    BlockType.QUOTE: quote_to_html,
+    BlockType.UNORDERED_LIST: unordered_list_to_html,
+    BlockType.ORDERED_LIST: ordered_list_to_html,
+}
+BLOCK_MATCHERS = []
+FINGERPRINT_MEMO = [None, ""]
+
+
+def register_block_type(block_type, converter, matcher=None):
+    BLOCK_CONVERTERS[block_type] = converter
+    BLOCK_HTML_RENDERERS.pop(block_type, None)
+    if matcher is not None:
+        BLOCK_MATCHERS.append((matcher, block_type))
@@ -0,0 +1,172 @@
+import functools
+import gzip
+import hashlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from profiling import profiled
+from progress import QUIET, ProgressReporter
+from static_sync import scan_tree
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+TEXT_EXTENSIONS = (".html", ".css", ".js", ".svg", ".json", ".xml", ".txt")
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+PRESERVED_HTML_PATTERN = re.compile(
+    r"<(pre|code|textarea|script|style)\b.*?</\1\s*>", re.DOTALL | re.IGNORECASE
+)
+HTML_COMMENT_PATTERN = re.compile(r"<!--(?!\[if).*?-->", re.DOTALL)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+CSS_STRING_OR_COMMENT_PATTERN = re.compile(
+    r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')|/\*.*?\*/", re.DOTALL
+)
+CSS_PUNCTUATION_PATTERN = re.compile(r"\s*([{};,>])\s*|(?<=:)\s+")
+
+
+def minify_html(html):
+    chunks = []
+    position = 0
+    for match in PRESERVED_HTML_PATTERN.finditer(html):
+        chunks.append(collapse_html(html[position : match.start()]))
+        chunks.append(match.group())
+        position = match.end()
+    chunks.append(collapse_html(html[position:]))
+    return "".join(chunks).strip()
+
+
+def collapse_html(html):
+    html = HTML_COMMENT_PATTERN.sub("", html)
+    return WHITESPACE_PATTERN.sub(collapse_space, html)
+
+
+def collapse_space(match):
+    return "\n" if "\n" in match.group() else " "
+
+
+def minify_css(css):
+    chunks = []
+    code = []
+    position = 0
+    for match in CSS_STRING_OR_COMMENT_PATTERN.finditer(css):
+        code.append(css[position : match.start()])
+        position = match.end()
+        if match.group(1) is None:
+            code.append(" ")
+            continue
+        chunks.append(collapse_css("".join(code)))
+        chunks.append(match.group(1))
+        code = []
+    code.append(css[position:])
+    chunks.append(collapse_css("".join(code)))
+    return "".join(chunks).strip()
+
+
+def collapse_css(css):
+    css = WHITESPACE_PATTERN.sub(" ", css)
+    css = CSS_PUNCTUATION_PATTERN.sub(r"\1", css)
+    return css.replace(";}", "}")
+
+
+MINIFIERS = {
+    ".html": minify_html,
+    ".css": minify_css,
+}
+
+
+def compressed_paths(path):
+    suffixes = COMPRESSED_SUFFIXES if brotli is not None else COMPRESSED_SUFFIXES[:1]
+    return [path + suffix for suffix in suffixes]
+
+
+def optimize_file(path, previous_hash=None, minify=True, precompress=True):
+    with open(path, "rb") as f:
+        data = f.read()
+    original_size = len(data)
+    minifier = MINIFIERS.get(os.path.splitext(path)[1]) if minify else None
+    if minifier is not None:
+        minified = minifier(data.decode()).encode()
+        if minified != data:
+            # Keep the mtime so sync_static still sees the copy as matching its source.
+            stat = os.stat(path)
+            write_atomic(path, minified)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            data = minified
+    compressed = 0
+    if precompress:
+        siblings = compressed_paths(path)
+        digest = hashlib.sha256(data).hexdigest()
+        if digest != previous_hash or not all(os.path.exists(sibling) for sibling in siblings):
+            write_atomic(siblings[0], gzip.compress(data, 9, mtime=0))
+            if brotli is not None:
+                write_atomic(siblings[1], brotli.compress(data))
+            compressed = len(siblings)
+    return original_size, len(data), compressed
+
+
+def write_atomic(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+@profiled("optimize_output")
+def optimize_output(
+    dest_dir,
+    minify=True,
+    precompress=True,
+    manifest=None,
+    workers=None,
+    chunksize=None,
+    reporter=None,
+):
+    reporter = reporter or ProgressReporter(QUIET)
+    files, _ = scan_tree(dest_dir)
+    paths = []
+    previous_hashes = []
+    skipped = 0
+    for relative_path in sorted(files):
+        if os.path.splitext(relative_path)[1] not in TEXT_EXTENSIONS:
+            continue
+        path = os.path.join(dest_dir, relative_path)
+        if manifest is not None:
+            siblings = compressed_paths(path) if precompress else []
+            if not manifest.is_stale(path, [path]) and all(
+                os.path.exists(sibling) for sibling in siblings
+            ):
+                skipped += 1
+                continue
+            previous_hashes.append(manifest.outputs.get(path, {}).get(path))
+        else:
+            previous_hashes.append(None)
+        paths.append(path)
+    reporter.add("output files unchanged", skipped)
+
+    optimize = functools.partial(optimize_file, minify=minify, precompress=precompress)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1 or len(paths) <= 1:
+        report_optimized(paths, map(optimize, paths, previous_hashes), manifest, reporter)
+        return paths
+
+    if chunksize is None:
+        chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(optimize, paths, previous_hashes, chunksize=chunksize)
+        report_optimized(paths, results, manifest, reporter)
+    return paths
+
+
+def report_optimized(paths, results, manifest, reporter):
+    for path, (original_size, size, compressed) in zip(paths, results):
+        if manifest is not None:
+            manifest.record(path, [path])
+        reporter.add("bytes minified away", original_size - size)
+        if compressed:
+            reporter.add("compressed copies written", compressed)
+        reporter.event("output files optimized", f"Optimized {path}: {original_size} -> {size} bytes")
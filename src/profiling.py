@@ -0,0 +1,130 @@
+import functools
+import json
+import os
+import time
+
+ENABLED = os.environ.get("SSG_PROFILE", "") not in ("", "0")
+TRACE_PATH = os.environ.get("SSG_PROFILE_TRACE", "build_trace.json")
+TOP_PAGES = int(os.environ.get("SSG_PROFILE_TOP", "10"))
+
+
+class Profiler:
+    def __init__(self):
+        self.stages = {}
+        self.pages = []
+        self.depth = {}
+
+    def record(self, stage, seconds, nbytes):
+        totals = self.stages.get(stage)
+        if totals is None:
+            totals = self.stages[stage] = [0, 0.0, 0]
+        totals[0] += 1
+        totals[1] += seconds
+        totals[2] += nbytes
+
+    def record_page(self, path, seconds, nbytes):
+        self.pages.append((path, seconds, nbytes))
+
+    def slowest_pages(self, top=TOP_PAGES):
+        return sorted(self.pages, key=lambda page: page[1], reverse=True)[:top]
+
+    def summary(self, top=TOP_PAGES):
+        lines = [f"{'stage':<20} {'calls':>10} {'seconds':>10} {'MB':>10} {'MB/s':>10}"]
+        for stage, (calls, seconds, nbytes) in sorted(
+            self.stages.items(), key=lambda item: item[1][1], reverse=True
+        ):
+            megabytes = nbytes / 1_000_000
+            rate = megabytes / seconds if seconds else 0.0
+            lines.append(f"{stage:<20} {calls:>10} {seconds:>10.4f} {megabytes:>10.2f} {rate:>10.2f}")
+        if self.pages:
+            lines.append(f"slowest {min(top, len(self.pages))} of {len(self.pages)} pages:")
+            for path, seconds, nbytes in self.slowest_pages(top):
+                lines.append(f"  {seconds * 1000:9.2f} ms {nbytes:>10} B  {path}")
+        return "\n".join(lines)
+
+    def trace(self, top=TOP_PAGES):
+        return {
+            "stages": {
+                stage: {"calls": calls, "seconds": seconds, "bytes": nbytes}
+                for stage, (calls, seconds, nbytes) in self.stages.items()
+            },
+            "slowest_pages": [
+                {"path": path, "seconds": seconds, "bytes": nbytes}
+                for path, seconds, nbytes in self.slowest_pages(top)
+            ],
+            "pages": len(self.pages),
+        }
+
+    def write_trace(self, path=TRACE_PATH, top=TOP_PAGES):
+        with open(path, "w") as f:
+            json.dump(self.trace(top), f, indent=2)
+
+
+profiler = Profiler()
+
+
+def input_length(args, result):
+    return len(args[0])
+
+
+def output_length(args, result):
+    return len(result)
+
+
+def file_size(args, result):
+    return os.path.getsize(args[0])
+
+
+def profiled(stage, size=None, page=False):
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            depth = profiler.depth.get(stage, 0)
+            profiler.depth[stage] = depth + 1
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                profiler.depth[stage] = depth
+            if depth == 0:
+                seconds = time.perf_counter() - start
+                nbytes = size(args, result) if size is not None else 0
+                profiler.record(stage, seconds, nbytes)
+                if page:
+                    profiler.record_page(args[0], seconds, nbytes)
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+def profiled_iter(stage, size=None):
+    # Generators run in slices between their consumer's work, so only time inside next() counts.
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            iterator = func(*args, **kwargs)
+            seconds = 0.0
+            try:
+                while True:
+                    start = time.perf_counter()
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        break
+                    finally:
+                        seconds += time.perf_counter() - start
+                    yield item
+            finally:
+                profiler.record(stage, seconds, size(args, None) if size is not None else 0)
+
+        return wrapper
+
+    return decorate
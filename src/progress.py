@@ -0,0 +1,55 @@
+import sys
+import time
+
+QUIET = 0
+INFO = 1
+VERBOSE = 2
+
+
+class ProgressReporter:
+    def __init__(self, level=INFO, stream=None, interval=1.0):
+        self.level = level
+        self.stream = stream if stream is not None else sys.stderr
+        self.interval = interval
+        self.counts = {}
+        self.pending = 0
+        self.started = time.monotonic()
+        self.last_progress = self.started
+
+    def event(self, kind, message=None):
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        if message is not None:
+            self.detail(message)
+        self.pending += 1
+        if self.pending >= 256:
+            self.pending = 0
+            self.progress()
+
+    def detail(self, message):
+        if self.level >= VERBOSE:
+            self.stream.write(f"{message}\n")
+
+    def add(self, kind, amount):
+        self.counts[kind] = self.counts.get(kind, 0) + amount
+
+    def progress(self):
+        if self.level < INFO:
+            return
+        now = time.monotonic()
+        if now - self.last_progress < self.interval:
+            return
+        self.last_progress = now
+        self.stream.write(f"... {self.format_counts()} ({now - self.started:.1f}s)\n")
+
+    def info(self, message):
+        if self.level >= INFO:
+            self.stream.write(f"{message}\n")
+
+    def summary(self, label):
+        if self.level >= INFO:
+            elapsed = time.monotonic() - self.started
+            self.stream.write(f"{label}: {self.format_counts()} in {elapsed:.2f}s\n")
+
+    def format_counts(self):
+        return ", ".join(f"{count} {kind}" for kind, count in self.counts.items()) or "nothing to do"
+
@@ -0,0 +1,168 @@
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from block_cache import BlockCache, counter_stats
+from depgraph import referenced_assets
+from htmlnode import escape_text
+from markdown_blocks import blocks_to_html, iter_file_blocks, write_blocks_html
+from progress import QUIET, ProgressReporter
+from profiling import ENABLED as PROFILING_ENABLED, profiled
+from template import load_template, template_dependencies
+
+block_cache = None
+
+
+def init_block_cache(cache_path):
+    global block_cache
+    block_cache = BlockCache(cache_path) if cache_path is not None else None
+
+
+def find_markdown_files(content_dir):
+    sources = []
+    for dirpath, dirnames, filenames in os.walk(content_dir):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.endswith(".md"):
+                sources.append(os.path.join(dirpath, filename))
+    return sources
+
+
+def output_path_for(source_path, content_dir, dest_dir):
+    relative_path = os.path.relpath(source_path, content_dir)
+    return os.path.join(dest_dir, os.path.splitext(relative_path)[0] + ".html")
+
+
+def source_path_for(output_path, content_dir, dest_dir):
+    relative_path = os.path.relpath(output_path, dest_dir)
+    return os.path.join(content_dir, os.path.splitext(relative_path)[0] + ".md")
+
+
+class PageScan:
+    def __init__(self, page_dir, static_dir=None):
+        self.page_dir = page_dir
+        self.static_dir = static_dir
+        self.title = None
+        self.assets = set()
+
+    def blocks(self, blocks):
+        for block in blocks:
+            if self.title is None and block.startswith("# "):
+                self.title = block[2:].split("\n", 1)[0].strip()
+            if self.static_dir is not None:
+                self.assets.update(referenced_assets([block], self.page_dir, self.static_dir))
+            yield block
+
+
+def rendered_length(args, result):
+    return result[0]
+
+
+@profiled("render_page", rendered_length, page=True)
+def render_page(source_path, output_path, template_path=None, content_dir=None, static_dir=None):
+    # Blocks stream from the source into the output file; only a template forces buffering.
+    scan = PageScan(os.path.dirname(os.path.relpath(source_path, content_dir or ".")), static_dir)
+    before = block_cache.counters() if block_cache is not None else (0, 0, 0)
+    blocks = scan.blocks(iter_file_blocks(source_path))
+    tmp_path = f"{output_path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", buffering=1 << 16) as f:
+            if template_path is None:
+                write_blocks_html(blocks, f, block_cache)
+            else:
+                html = blocks_to_html(blocks, block_cache)
+                if scan.title is None:
+                    raise ValueError("invalid markdown: no h1 header")
+                values = {"Title": escape_text(scan.title), "Content": html}
+                f.write(load_template(template_path).render(values))
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        if block_cache is not None:
+            block_cache.flush()
+    # Pool workers each hold their own cache, so send this page's counters back with the result.
+    after = block_cache.counters() if block_cache is not None else (0, 0, 0)
+    counters = tuple(end - start for start, end in zip(before, after))
+    return os.path.getsize(output_path), sorted(scan.assets), counters
+
+
+def render_directory(
+    content_dir,
+    dest_dir,
+    workers=None,
+    chunksize=None,
+    manifest=None,
+    cache_path=None,
+    reporter=None,
+    template_path=None,
+    graph=None,
+    static_dir=None,
+):
+    reporter = reporter or ProgressReporter(QUIET)
+    sources = find_markdown_files(content_dir)
+    outputs = [output_path_for(source, content_dir, dest_dir) for source in sources]
+    dependencies = template_dependencies(template_path) if template_path is not None else []
+    if graph is not None:
+        graph.prune(set(outputs))
+    render = functools.partial(
+        render_page,
+        template_path=template_path,
+        content_dir=content_dir,
+        static_dir=static_dir if graph is not None else None,
+    )
+    if manifest is not None:
+        pending = [
+            (source, output)
+            for source, output in zip(sources, outputs)
+            if manifest.is_stale(output, [source, *dependencies])
+        ]
+        sources = [source for source, _ in pending]
+        outputs = [output for _, output in pending]
+
+    for directory in sorted({os.path.dirname(output) for output in outputs}):
+        os.makedirs(directory, exist_ok=True)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if PROFILING_ENABLED:
+        # Pool workers keep their own profiler, so render in-process to trace every page.
+        workers = 1
+    if workers == 1 or len(sources) <= 1:
+        init_block_cache(cache_path)
+        results = map(render, sources, outputs)
+        counters = record_pages(sources, outputs, results, dependencies, manifest, graph, reporter)
+        if block_cache is not None:
+            block_cache.close()
+            init_block_cache(None)
+        report_cache_stats(cache_path, counters, reporter)
+        return outputs
+
+    if chunksize is None:
+        chunksize = max(1, len(sources) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_block_cache, initargs=(cache_path,)
+    ) as executor:
+        results = executor.map(render, sources, outputs, chunksize=chunksize)
+        counters = record_pages(sources, outputs, results, dependencies, manifest, graph, reporter)
+    report_cache_stats(cache_path, counters, reporter)
+    return outputs
+
+
+def record_pages(sources, outputs, results, dependencies, manifest, graph, reporter):
+    totals = [0, 0, 0]
+    for source, output, (_, assets, counters) in zip(sources, outputs, results):
+        for index, count in enumerate(counters):
+            totals[index] += count
+        if manifest is not None:
+            manifest.record(output, [source, *dependencies])
+        if graph is not None:
+            graph.set_dependencies(output, [source, *dependencies, *assets])
+        reporter.event("pages rendered", f"Rendered page: {source} to {output}")
+    return totals
+
+
+def report_cache_stats(cache_path, counters, reporter):
+    if cache_path is not None:
+        reporter.info(f"Block cache: {counter_stats(*counters)}")
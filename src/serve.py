@@ -0,0 +1,346 @@
+import ctypes
+import ctypes.util
+import functools
+import os
+import select
+import struct
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from render_pages import find_markdown_files, output_path_for, render_page, source_path_for
+from static_sync import sync_file
+from template import template_dependencies
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+LIVERELOAD_PATH = "/__livereload"
+LIVERELOAD_SCRIPT = (
+    "<script>new EventSource(\"" + LIVERELOAD_PATH + "\")"
+    ".onmessage = function () { location.reload(); };</script>"
+)
+
+
+class InotifyWatcher:
+    def __init__(self, roots, files=()):
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            raise OSError("libc not found")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+        self.files = {os.path.normpath(path) for path in files}
+        self.file_dirs = set()
+        for root in roots:
+            self.add_tree(root)
+        for path in self.files:
+            dirpath = os.path.dirname(path) or "."
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed: {dirpath}")
+            if wd not in self.watches:
+                self.watches[wd] = dirpath
+                self.file_dirs.add(wd)
+
+    def add_tree(self, root):
+        found = []
+        for dirpath, _, filenames in os.walk(root):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed: {dirpath}")
+            self.watches[wd] = dirpath
+            found.extend(os.path.join(dirpath, filename) for filename in filenames)
+        return found
+
+    def wait(self, timeout):
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        data = os.read(self.fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + name_length].rstrip(b"\0")
+            offset += name_length
+            dirpath = self.watches.get(wd)
+            if dirpath is None or not name:
+                continue
+            path = os.path.normpath(os.path.join(dirpath, os.fsdecode(name)))
+            if wd in self.file_dirs and path not in self.files:
+                continue
+            changed.add(path)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                changed.update(self.add_tree(path))
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    def __init__(self, roots, interval=0.05, files=()):
+        self.roots = roots
+        self.files = [os.path.normpath(path) for path in files]
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self):
+        snapshot = {}
+        for root in self.roots:
+            for dirpath, _, filenames in os.walk(root):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        for path in self.files:
+            if os.path.exists(path):
+                stat = os.stat(path)
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            snapshot = self.scan()
+            changed = {
+                path
+                for path in snapshot.keys() | self.snapshot.keys()
+                if snapshot.get(path) != self.snapshot.get(path)
+            }
+            self.snapshot = snapshot
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+def make_watcher(roots, polling=False, files=()):
+    roots = [root for root in roots if os.path.isdir(root)]
+    files = [path for path in files if os.path.isfile(path)]
+    if not polling:
+        try:
+            return InotifyWatcher(roots, files)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(roots, files=files)
+
+
+def collect_changes(watcher, debounce=0.03):
+    changed = set()
+    while not changed:
+        changed = watcher.wait(1.0)
+    while True:
+        more = watcher.wait(debounce)
+        if not more:
+            return changed
+        changed.update(more)
+
+
+def rebuild_changed(changed, content_dir, static_dir, dest_dir, template_path=None, graph=None):
+    # A half-typed page or template must not stop the watch loop: report it, keep the
+    # last good output in place, and carry on with the other files.
+    rebuilt = []
+    try:
+        dependencies = template_dependencies(template_path) if template_path is not None else []
+    except (ValueError, OSError) as error:
+        report_rebuild_error(template_path, error)
+        return rebuilt
+    if graph is not None:
+        affected = graph.affected_outputs(changed)
+        changed = set(changed) | {
+            source_path_for(output, content_dir, dest_dir) for output in affected
+        }
+    elif changed & set(dependencies):
+        changed = set(changed) | set(find_markdown_files(content_dir))
+    for path in sorted(changed):
+        try:
+            output = rebuild_path(
+                path, content_dir, static_dir, dest_dir, template_path, graph, dependencies
+            )
+        except (ValueError, OSError) as error:
+            report_rebuild_error(path, error)
+            continue
+        if output is not None:
+            rebuilt.append(output)
+    return rebuilt
+
+
+def rebuild_path(path, content_dir, static_dir, dest_dir, template_path, graph, dependencies):
+    if is_within(path, content_dir):
+        if not path.endswith(".md"):
+            return None
+        output = output_path_for(path, content_dir, dest_dir)
+        if os.path.isfile(path):
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+            _, assets, _ = render_page(
+                path,
+                output,
+                template_path,
+                content_dir,
+                static_dir if graph is not None else None,
+            )
+            if graph is not None:
+                graph.set_dependencies(output, [path, *dependencies, *assets])
+        elif os.path.isfile(output):
+            os.remove(output)
+            if graph is not None:
+                graph.remove(output)
+        return output
+    if is_within(path, static_dir):
+        output = os.path.join(dest_dir, os.path.relpath(path, static_dir))
+        if os.path.isfile(path):
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+            sync_file(path, output, "copy")
+        elif os.path.isfile(output) and not os.path.exists(path):
+            os.remove(output)
+            remove_empty_dirs(os.path.dirname(output), dest_dir)
+        elif os.path.isdir(output) and not os.path.exists(path):
+            # Rendered pages can share the directory; only drop it once it is empty.
+            if not remove_empty_dirs(output, dest_dir):
+                return None
+        else:
+            return None
+        return output
+    return None
+
+
+def remove_empty_dirs(directory, dest_dir):
+    removed = False
+    while not os.path.samefile(directory, dest_dir) and not os.listdir(directory):
+        os.rmdir(directory)
+        removed = True
+        directory = os.path.dirname(directory)
+    return removed
+
+
+def report_rebuild_error(path, error):
+    print(f"Failed to rebuild {path}: {error}")
+
+
+def is_within(path, root):
+    return os.path.commonpath([os.path.abspath(path), os.path.abspath(root)]) == os.path.abspath(root)
+
+
+class LiveReload:
+    def __init__(self):
+        self.version = 0
+        self.condition = threading.Condition()
+
+    def notify(self):
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+
+    def wait(self, version, timeout):
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == LIVERELOAD_PATH:
+            self.stream_reloads()
+            return
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and self.path.split("?", 1)[0].endswith("/"):
+            path = os.path.join(path, "index.html")
+        if path.endswith(".html") and os.path.isfile(path):
+            self.send_html(path)
+            return
+        super().do_GET()
+
+    def send_html(self, path):
+        with open(path, "rb") as f:
+            body = f.read() + LIVERELOAD_SCRIPT.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_reloads(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        version = self.server.live_reload.version
+        try:
+            while True:
+                new_version = self.server.live_reload.wait(version, 15)
+                if new_version == version:
+                    self.wfile.write(b": keepalive\n\n")
+                else:
+                    version = new_version
+                    self.wfile.write(b"data: reload\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(
+    dest_dir,
+    port=8888,
+    watch=False,
+    content_dir="content",
+    static_dir="static",
+    polling=False,
+    template_path=None,
+    graph=None,
+):
+    live_reload = LiveReload()
+    handler = functools.partial(LiveReloadHandler, directory=dest_dir)
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    server.live_reload = live_reload
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Serving {dest_dir} at http://127.0.0.1:{port}/")
+    try:
+        if not watch:
+            threading.Event().wait()
+        files = template_dependencies(template_path) if template_path is not None else []
+        watcher = make_watcher([content_dir, static_dir], polling, files)
+        print(f"Watching {content_dir} and {static_dir} with {type(watcher).__name__}")
+        while True:
+            changed = collect_changes(watcher)
+            start = time.perf_counter()
+            rebuilt = rebuild_changed(
+                changed, content_dir, static_dir, dest_dir, template_path, graph
+            )
+            if graph is not None and graph.path is not None:
+                graph.save()
+            if rebuilt:
+                live_reload.notify()
+                elapsed = (time.perf_counter() - start) * 1000
+                print(f"Rebuilt {len(rebuilt)} file(s) in {elapsed:.1f} ms")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
@@ -0,0 +1,163 @@
+import fcntl
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from profiling import profiled
+from progress import QUIET, ProgressReporter
+
+FICLONE = 0x40049409
+SYNC_MODES = ("copy", "hardlink", "reflink")
+
+
+class SyncResult:
+    def __init__(self):
+        self.copied = []
+        self.skipped = 0
+        self.removed = []
+
+    def __repr__(self):
+        return f"SyncResult(copied: {len(self.copied)}, skipped: {self.skipped}, removed: {len(self.removed)})"
+
+
+def scan_tree(root):
+    files = {}
+    dirs = []
+    if not os.path.isdir(root):
+        return files, dirs
+    pending = [""]
+    while pending:
+        relative_dir = pending.pop()
+        with os.scandir(os.path.join(root, relative_dir)) as entries:
+            for entry in entries:
+                relative_path = os.path.join(relative_dir, entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(relative_path)
+                    pending.append(relative_path)
+                else:
+                    stat = entry.stat()
+                    files[relative_path] = (stat.st_size, stat.st_mtime_ns)
+    return files, dirs
+
+
+@profiled("copy_static")
+def sync_static(
+    source_dir,
+    dest_dir,
+    mode="copy",
+    workers=8,
+    keep=None,
+    keep_suffixes=(),
+    reporter=None,
+    transforms=None,
+):
+    if mode not in SYNC_MODES:
+        raise ValueError(f"invalid sync mode: {mode}")
+    reporter = reporter or ProgressReporter(QUIET)
+    keep = keep or set()
+    transforms = transforms or {}
+    result = SyncResult()
+    source_files, source_dirs = scan_tree(source_dir)
+    dest_files, dest_dirs = scan_tree(dest_dir)
+
+    for relative_path in dest_files:
+        dest_path = os.path.join(dest_dir, relative_path)
+        if relative_path not in source_files and dest_path not in keep:
+            base_path, suffix = os.path.splitext(relative_path)
+            if suffix in keep_suffixes and (
+                base_path in source_files or os.path.join(dest_dir, base_path) in keep
+            ):
+                continue
+            os.remove(dest_path)
+            result.removed.append(dest_path)
+            reporter.event("stale files removed", f"Removed stale file: {dest_path}")
+    source_dir_set = set(source_dirs)
+    for relative_dir in sorted(dest_dirs, key=len, reverse=True):
+        dest_path = os.path.join(dest_dir, relative_dir)
+        if relative_dir not in source_dir_set and not os.listdir(dest_path):
+            os.rmdir(dest_path)
+            result.removed.append(dest_path)
+
+    os.makedirs(dest_dir, exist_ok=True)
+    for relative_dir in sorted(source_dirs):
+        os.makedirs(os.path.join(dest_dir, relative_dir), exist_ok=True)
+
+    jobs = []
+    for relative_path, signature in source_files.items():
+        transform = transforms.get(os.path.splitext(relative_path)[1])
+        dest_signature = dest_files.get(relative_path)
+        if transform is None:
+            unchanged = dest_signature == signature
+        else:
+            # Transformed copies keep the source mtime but not its size.
+            unchanged = dest_signature is not None and dest_signature[1] == signature[1]
+        if unchanged:
+            result.skipped += 1
+            continue
+        jobs.append(
+            (
+                os.path.join(source_dir, relative_path),
+                os.path.join(dest_dir, relative_path),
+                transform,
+            )
+        )
+
+    reporter.add("static files unchanged", result.skipped)
+    if workers <= 1 or len(jobs) <= 1:
+        done = map(lambda job: sync_job(job, mode), jobs)
+        report_copies(jobs, done, result, reporter)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            done = executor.map(lambda job: sync_job(job, mode), jobs)
+            report_copies(jobs, done, result, reporter)
+    return result
+
+
+def sync_job(job, mode):
+    source_path, dest_path, transform = job
+    if transform is None:
+        sync_file(source_path, dest_path, mode)
+    else:
+        transform_file(source_path, dest_path, transform)
+
+
+def report_copies(jobs, done, result, reporter):
+    for (source_path, dest_path, _), _ in zip(jobs, done):
+        result.copied.append(dest_path)
+        reporter.event("static files copied", f"Copied file: {source_path} to {dest_path}")
+
+
+def sync_file(source_path, dest_path, mode):
+    if mode == "hardlink":
+        if os.path.lexists(dest_path):
+            os.remove(dest_path)
+        try:
+            os.link(source_path, dest_path)
+            return
+        except OSError:
+            pass
+    elif mode == "reflink":
+        try:
+            reflink_file(source_path, dest_path)
+            return
+        except OSError:
+            pass
+    if os.path.lexists(dest_path) and os.path.samefile(source_path, dest_path):
+        os.remove(dest_path)
+    shutil.copy2(source_path, dest_path)
+
+
+def transform_file(source_path, dest_path, transform):
+    with open(source_path, encoding="utf-8") as f:
+        text = transform(f.read())
+    tmp_path = f"{dest_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    shutil.copystat(source_path, tmp_path)
+    os.replace(tmp_path, dest_path)
+
+
+def reflink_file(source_path, dest_path):
+    with open(source_path, "rb") as source, open(dest_path, "wb") as dest:
+        fcntl.ioctl(dest.fileno(), FICLONE, source.fileno())
+    shutil.copystat(source_path, dest_path)
@@ -0,0 +1,67 @@
+import os
+import re
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+PARTIAL_PATTERN = re.compile(r"\{\{>\s*([^\s{}]+)\s*\}\}")
+
+loaded_templates = {}
+
+
+class Template:
+    def __init__(self, source, includes=()):
+        self.includes = list(includes)
+        self.parts = []
+        self.slots = []
+        start = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            self.parts.append(source[start : match.start()])
+            self.slots.append((len(self.parts), match.group(1)))
+            self.parts.append(None)
+            start = match.end()
+        self.parts.append(source[start:])
+        self.fields = {name for _, name in self.slots}
+
+    def render(self, values):
+        parts = self.parts.copy()
+        for index, name in self.slots:
+            value = values.get(name)
+            if value is None:
+                raise ValueError(f"missing template field: {name}")
+            parts[index] = value
+        return "".join(parts)
+
+    def __repr__(self):
+        return f"Template(fields: {sorted(self.fields)})"
+
+
+def load_template(path):
+    loaded = loaded_templates.get(path)
+    if loaded is not None and all(
+        os.stat(file_path).st_mtime_ns == mtime for file_path, mtime in loaded[0]
+    ):
+        return loaded[1]
+    includes = []
+    source = read_with_partials(path, includes, [path])
+    template = Template(source, includes)
+    stamps = [(file_path, os.stat(file_path).st_mtime_ns) for file_path in [path, *includes]]
+    loaded_templates[path] = (stamps, template)
+    return template
+
+
+def read_with_partials(path, includes, stack):
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+
+    def include(match):
+        partial_path = os.path.normpath(os.path.join(os.path.dirname(path), match.group(1)))
+        if partial_path in stack:
+            raise ValueError(f"recursive template partial: {partial_path}")
+        if partial_path not in includes:
+            includes.append(partial_path)
+        return read_with_partials(partial_path, includes, [*stack, partial_path])
+
+    return PARTIAL_PATTERN.sub(include, source)
+
+
+def template_dependencies(path):
+    return [path, *load_template(path).includes]
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+
+from block_cache import BlockCache
+from htmlnode import LeafNode
+from markdown_blocks import markdown_to_html, markdown_to_html_node
+from textnode import TEXT_NODE_CONVERTERS, TEXT_NODE_HTML_RENDERERS, TextType, register_text_type
+
+
+class TestBlockCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = BlockCache()
+        self.assertIsNone(cache.get("# Title"))
+        cache.put("# Title", "<h1>Title</h1>")
+        self.assertEqual(cache.get("# Title"), "<h1>Title</h1>")
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_lru_eviction(self):
+        cache = BlockCache(max_entries=2)
+        cache.put("a", "A")
+        cache.put("b", "B")
+        cache.get("a")
+        cache.put("c", "C")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "A")
+        self.assertEqual(cache.get("c"), "C")
+
+    def test_persists_between_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite")
+            cache = BlockCache(path)
+            cache.put("footer", "<p>footer</p>")
+            cache.close()
+            cache = BlockCache(path)
+            self.assertEqual(cache.get("footer"), "<p>footer</p>")
+            self.assertEqual(cache.stats()["disk_hits"], 1)
+            cache.close()
+
+    def test_markdown_to_html_node_with_cache(self):
+        md = """
+# Title
+
+This is **bolded** paragraph
+
+- a list
+- of items
+"""
+        cache = BlockCache()
+        expected = markdown_to_html_node(md).to_html()
+        self.assertEqual(markdown_to_html_node(md, cache).to_html(), expected)
+        self.assertEqual(markdown_to_html_node(md, cache).to_html(), expected)
+        self.assertEqual(cache.stats()["hits"], 3)
+        self.assertEqual(cache.stats()["misses"], 3)
+
+    def test_registered_converters_change_the_key(self):
+        md = "See [docs](/docs)"
+        cache = BlockCache()
+        self.assertEqual(markdown_to_html(md, cache), '<div><p>See <a href="/docs">docs</a></p></div>')
+        original = TEXT_NODE_CONVERTERS[TextType.LINK]
+        original_renderer = TEXT_NODE_HTML_RENDERERS[TextType.LINK]
+        register_text_type(
+            TextType.LINK,
+            lambda node: LeafNode("a", node.text, {"href": node.url, "rel": "nofollow"}),
+        )
+        try:
+            html = markdown_to_html(md, cache)
+        finally:
+            TEXT_NODE_CONVERTERS[TextType.LINK] = original
+            TEXT_NODE_HTML_RENDERERS[TextType.LINK] = original_renderer
+        self.assertEqual(html, '<div><p>See <a href="/docs" rel="nofollow">docs</a></p></div>')
+        self.assertEqual(cache.stats()["hits"], 0)
+        self.assertEqual(markdown_to_html(md, cache), '<div><p>See <a href="/docs">docs</a></p></div>')
+        self.assertEqual(cache.stats()["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+from build import build_site
+
+
+class TestBuildSite(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.static = os.path.join(self.tmp.name, "static")
+        self.public = os.path.join(self.tmp.name, "public")
+        os.makedirs(os.path.join(self.content, "blog", "2024"))
+        os.mkdir(self.static)
+        self.template = os.path.join(self.tmp.name, "template.html")
+        files = {
+            self.template: "<title>{{ Title }}</title>{{ Content }}",
+            os.path.join(self.content, "index.md"): "# Home\n\nWelcome",
+            os.path.join(self.content, "blog", "2024", "post.md"): "# Post\n\n![x](/x.png)",
+            os.path.join(self.static, "x.png"): "png",
+            os.path.join(self.static, "index.css"): "body {\n  margin: 0;\n}\n",
+        }
+        for path, content in files.items():
+            with open(path, "w") as f:
+                f.write(content)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, **kwargs):
+        return build_site(
+            self.content,
+            self.static,
+            self.public,
+            self.template,
+            workers=1,
+            state_dir=self.tmp.name,
+            **kwargs,
+        )
+
+    def test_builds_pages_and_static(self):
+        result = self.build()
+        post = os.path.join(self.public, "blog", "2024", "post.html")
+        self.assertEqual(len(result.rendered), 2)
+        self.assertEqual(
+            sorted(result.static.copied),
+            [os.path.join(self.public, "index.css"), os.path.join(self.public, "x.png")],
+        )
+        with open(post) as f:
+            self.assertEqual(f.read(), '<title>Post</title><div><h1>Post</h1><p><img src="/x.png" alt="x"></img></p></div>')
+        self.assertEqual(result.graph.affected_outputs({os.path.join(self.static, "x.png")}), {post})
+        self.assertNotIn("post.html.tmp", os.listdir(os.path.dirname(post)))
+
+    def test_incremental_rebuild_renders_nothing(self):
+        self.build(incremental=True)
+        result = self.build(incremental=True)
+        self.assertEqual(result.rendered, [])
+        self.assertEqual(len(result.pages), 2)
+
+    def test_minified_rebuild_copies_no_static_files(self):
+        self.build(minify=True)
+        result = self.build(minify=True)
+        self.assertEqual(result.static.copied, [])
+        with open(os.path.join(self.public, "index.css")) as f:
+            self.assertEqual(f.read(), "body{margin:0}")
+        result = self.build()
+        self.assertEqual(result.static.copied, [os.path.join(self.public, "index.css")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from depgraph import DependencyGraph, local_asset_path, referenced_assets
+
+
+class TestDependencyGraph(unittest.TestCase):
+    def test_affected_outputs(self):
+        graph = DependencyGraph()
+        graph.set_dependencies("public/a.html", ["content/a.md", "template.html", "static/logo.png"])
+        graph.set_dependencies("public/b.html", ["content/b.md", "template.html"])
+        self.assertEqual(graph.affected_outputs({"static/logo.png"}), {"public/a.html"})
+        self.assertEqual(
+            graph.affected_outputs({"./template.html"}), {"public/a.html", "public/b.html"}
+        )
+        self.assertEqual(graph.affected_outputs({"static/other.png"}), set())
+
+    def test_affected_outputs_is_transitive(self):
+        graph = DependencyGraph()
+        graph.set_dependencies("partials/nav.html", ["data/menu.json"])
+        graph.set_dependencies("public/a.html", ["partials/nav.html"])
+        self.assertEqual(
+            graph.affected_outputs({"data/menu.json"}), {"partials/nav.html", "public/a.html"}
+        )
+
+    def test_set_dependencies_replaces_edges(self):
+        graph = DependencyGraph()
+        graph.set_dependencies("public/a.html", ["content/a.md", "static/old.png"])
+        graph.set_dependencies("public/a.html", ["content/a.md", "static/new.png"])
+        self.assertEqual(graph.affected_outputs({"static/old.png"}), set())
+        self.assertNotIn("static/old.png", graph.dependents)
+        graph.prune(set())
+        self.assertEqual(graph.dependencies, {})
+        self.assertEqual(graph.dependents, {})
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "graph.json")
+            graph = DependencyGraph(path)
+            graph.set_dependencies("public/a.html", ["content/a.md", "template.html"])
+            graph.save()
+            loaded = DependencyGraph(path)
+            self.assertEqual(loaded.dependencies, graph.dependencies)
+            self.assertEqual(loaded.affected_outputs({"template.html"}), {"public/a.html"})
+
+
+class TestReferencedAssets(unittest.TestCase):
+    def test_local_asset_path(self):
+        self.assertEqual(local_asset_path("/images/a.png", "blog", "static"), "static/images/a.png")
+        self.assertEqual(local_asset_path("a.png?v=2", "blog", "static"), "static/blog/a.png")
+        self.assertIsNone(local_asset_path("https://example.com/a.png", "", "static"))
+        self.assertIsNone(local_asset_path("/blog/post", "", "static"))
+        self.assertIsNone(local_asset_path("../../a.png", "blog", "static"))
+
+    def test_referenced_assets(self):
+        blocks = ["![a](/a.png) and [doc](/files/doc.pdf)", "[page](/blog/) ![b](/a.png)"]
+        self.assertEqual(
+            referenced_assets(blocks, "", "static"), ["static/a.png", "static/files/doc.pdf"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,14 @@
+import io
 import unittest
-from htmlnode import LeafNode, ParentNode, HTMLNode
+from htmlnode import (
+    LeafNode,
+    ParentNode,
+    HTMLNode,
+    SafeHTML,
+    count_nodes,
+    transform_tree,
+    write_html,
+)
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -49,6 +58,10 @@ class TestHTMLNode(unittest.TestCase):
             "HTMLNode(p, What a strange world, children: None, {'class': 'primary'})",
         )
 
+    def test_no_instance_dict(self):
+        for node in (HTMLNode("p"), LeafNode("b", "x"), ParentNode("div", [])):
+            self.assertFalse(hasattr(node, "__dict__"))
+
     def test_leaf_to_html_p(self):
         node = LeafNode("p", "Hello, world!")
         self.assertEqual(node.to_html(), "<p>Hello, world!</p>")
@@ -108,6 +121,114 @@ class TestHTMLNode(unittest.TestCase):
             "<h2><b>Bold text</b>Normal text<i>italic text</i>Normal text</h2>",
         )
 
+    def test_write_html(self):
+        node = ParentNode(
+            "p",
+            [
+                LeafNode("b", "Bold text"),
+                ParentNode("span", [LeafNode(None, "Normal text")]),
+            ],
+        )
+        buffer = io.StringIO()
+        write_html(node, buffer)
+        self.assertEqual(buffer.getvalue(), node.to_html())
+        self.assertEqual(
+            buffer.getvalue(),
+            "<p><b>Bold text</b><span>Normal text</span></p>",
+        )
+
+    def test_escapes_text_and_attributes(self):
+        node = ParentNode(
+            "p",
+            [
+                LeafNode(None, "a < b & c > d"),
+                LeafNode("a", 'say "hi"', {"href": '/search?q="x"&page=1'}),
+            ],
+        )
+        self.assertEqual(
+            node.to_html(),
+            '<p>a &lt; b &amp; c &gt; d<a href="/search?q=&quot;x&quot;&amp;page=1">say "hi"</a></p>',
+        )
+
+    def test_non_string_values_are_stringified(self):
+        self.assertEqual(LeafNode("img", "", {"width": 100}).to_html(), '<img width="100"></img>')
+        self.assertEqual(LeafNode("b", 5).to_html(), "<b>5</b>")
+        node = ParentNode("ol", [LeafNode("li", "x")], {"start": 3})
+        self.assertEqual(node.to_html(), '<ol start="3"><li>x</li></ol>')
+
+    def test_safe_html_is_not_escaped(self):
+        node = LeafNode(None, SafeHTML("<b>already</b> &amp; rendered"))
+        self.assertEqual(node.to_html(), "<b>already</b> &amp; rendered")
+
+    def test_cached_tags_invalidate_on_change(self):
+        node = LeafNode("a", "docs", {"href": "/old"})
+        self.assertEqual(node.to_html(), '<a href="/old">docs</a>')
+        node.props = {"href": "/new"}
+        self.assertEqual(node.to_html(), '<a href="/new">docs</a>')
+        node.tag = "span"
+        self.assertEqual(node.to_html(), '<span href="/new">docs</span>')
+        parent = ParentNode("p", [node])
+        self.assertEqual(parent.to_html(), '<p><span href="/new">docs</span></p>')
+        parent.tag = "div"
+        self.assertEqual(parent.to_html(), '<div><span href="/new">docs</span></div>')
+
+    def test_props_are_copied(self):
+        props = {"href": "/a"}
+        node = LeafNode("a", "x", props)
+        self.assertEqual(node.to_html(), '<a href="/a">x</a>')
+        props["href"] = "/b"
+        self.assertEqual(node.props, {"href": "/a"})
+        self.assertEqual(node.to_html(), '<a href="/a">x</a>')
+        node.props = props
+        props["href"] = "/c"
+        self.assertEqual(node.to_html(), '<a href="/b">x</a>')
+
+    def test_props_are_read_only(self):
+        node = LeafNode("a", "docs", {"href": "/old"})
+        self.assertEqual(node.props, {"href": "/old"})
+        with self.assertRaises(TypeError):
+            node.props["href"] = "/new"
+
+    def test_deep_tree_serializes_without_recursion(self):
+        node = LeafNode("b", "deep")
+        for _ in range(50_000):
+            node = ParentNode("blockquote", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<blockquote>" * 50_000 + "<b>deep</b>"))
+        self.assertEqual(count_nodes(node), 50_001)
+        buffer = io.StringIO()
+        write_html(node, buffer)
+        self.assertEqual(buffer.getvalue(), html)
+
+    def test_transform_tree(self):
+        node = ParentNode(
+            "div",
+            [
+                ParentNode("p", [LeafNode(None, "keep"), LeafNode("i", "drop")]),
+                LeafNode("b", "bold"),
+            ],
+        )
+
+        def visit(child):
+            if child.tag == "i":
+                return None
+            if child.tag == "b":
+                return LeafNode("strong", child.value)
+            return child
+
+        self.assertEqual(
+            transform_tree(node, visit).to_html(),
+            "<div><p>keep</p><strong>bold</strong></div>",
+        )
+        self.assertEqual(node.to_html(), "<div><p>keep<i>drop</i></p><b>bold</b></div>")
+        self.assertIs(transform_tree(node, lambda child: child), node)
+
+    def test_to_html_no_children(self):
+        node = ParentNode("div", None)
+        with self.assertRaises(ValueError):
+            node.to_html()
+
+
 
 if __name__ == "__main__":
     unittest.main()
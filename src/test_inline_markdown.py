@@ -161,6 +161,16 @@ class TestInlineMarkdown(unittest.TestCase):
             new_nodes,
         )
 
+    def test_split_link_same_literal_as_image(self):
+        node = TextNode("![a](b) and [a](b)", TextType.TEXT)
+        self.assertListEqual(
+            [
+                TextNode("![a](b) and ", TextType.TEXT),
+                TextNode("a", TextType.LINK, "b"),
+            ],
+            split_nodes_link([node]),
+        )
+
     def test_split_no_images_or_links(self):
         node = TextNode("This is plain text with no special formatting.", TextType.TEXT)
         self.assertListEqual([node], split_nodes_link([node]))
@@ -219,6 +229,27 @@ class TestInlineMarkdown(unittest.TestCase):
 ]
         self.assertListEqual(expected, new_textnodes)
 
+    def test_text_to_textnodes_nested_delimiters_literal(self):
+        new_textnodes = text_to_textnodes("**bold_with_underscores** and _it`al`ic_")
+        expected = [
+            TextNode("bold_with_underscores", TextType.BOLD),
+            TextNode(" and ", TextType.TEXT),
+            TextNode("it`al`ic", TextType.ITALIC),
+        ]
+        self.assertListEqual(expected, new_textnodes)
+
+    def test_text_to_textnodes_empty(self):
+        self.assertListEqual([], text_to_textnodes(""))
+        self.assertListEqual([TextNode("a", TextType.TEXT), TextNode("b", TextType.TEXT)], text_to_textnodes("a****b"))
+
+    def test_text_to_textnodes_unclosed(self):
+        with self.assertRaises(ValueError):
+            text_to_textnodes("This is **not closed")
+        with self.assertRaises(ValueError):
+            text_to_textnodes("**bold [link](https://boot.dev) across**")
+        with self.assertRaises(ValueError):
+            text_to_textnodes("`code _with_ italic`")
+
 
 
 if __name__ == "__main__":
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+
+from manifest import BuildManifest
+
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "page.md")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        self.output = os.path.join(self.tmp.name, "page.html")
+        self.manifest_path = os.path.join(self.tmp.name, "manifest.json")
+        for path in (self.source, self.template, self.output):
+            with open(path, "w") as f:
+                f.write("original")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_new_output_is_stale(self):
+        manifest = BuildManifest(self.manifest_path)
+        self.assertTrue(manifest.is_stale(self.output, [self.source]))
+
+    def test_recorded_output_is_fresh_after_reload(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record(self.output, [self.source, self.template])
+        manifest.save()
+        manifest = BuildManifest(self.manifest_path)
+        self.assertFalse(manifest.is_stale(self.output, [self.source, self.template]))
+
+    def test_dependency_change_is_stale(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record(self.output, [self.source, self.template])
+        with open(self.template, "w") as f:
+            f.write("changed layout")
+        self.assertTrue(manifest.is_stale(self.output, [self.source, self.template]))
+
+    def test_touch_without_content_change_is_fresh(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record(self.output, [self.source])
+        stat = os.stat(self.source)
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertFalse(manifest.is_stale(self.output, [self.source]))
+
+    def test_prune_returns_outputs_not_seen(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record(self.output, [self.source])
+        manifest.save()
+        manifest = BuildManifest(self.manifest_path)
+        self.assertEqual(manifest.prune(), [self.output])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,28 @@
+import io
+import os
+import tempfile
 import unittest
+from enum import Enum
+
+from htmlnode import LazyParentNode, LeafNode, transform_tree
 
 from markdown_blocks import (
     BlockType,
+    iter_blocks,
+    iter_file_blocks,
+    MMAP_THRESHOLD,
+    write_blocks_html,
     markdown_to_blocks,
+    write_markdown_html,
+    register_block_type,
+    BLOCK_CONVERTERS,
+    BLOCK_HTML_RENDERERS,
+    BLOCK_MATCHERS,
+    outline,
+    word_count,
     block_to_block_type,
+    classify_block,
+    markdown_to_html,
     markdown_to_html_node,
     paragraph_to_html_node,
     heading_to_html_node,
@@ -58,6 +77,61 @@ This is the same paragraph on a new line
             ],
         )
 
+    def test_markdown_to_blocks_keeps_fenced_code(self):
+        md = "Intro\n\n```\nfirst\n\n\nsecond\n```\n\nOutro"
+        self.assertEqual(
+            markdown_to_blocks(md),
+            ["Intro", "```\nfirst\n\n\nsecond\n```", "Outro"],
+        )
+
+    def test_one_line_code_block_does_not_open_fence(self):
+        md = "```x = 1```\n\nPara two\n\n## Sub\n\n```\na\n\nb\n```"
+        expected = ["```x = 1```", "Para two", "## Sub", "```\na\n\nb\n```"]
+        self.assertEqual(markdown_to_blocks(md), expected)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.md")
+            with open(path, "w") as f:
+                f.write(md)
+            self.assertEqual(list(iter_file_blocks(path)), expected)
+
+    def test_iter_blocks_from_file(self):
+        source = io.StringIO("# Title\r\n\r\n\r\nSome text\nmore text\n   \n- item\n")
+        self.assertEqual(
+            list(iter_blocks(source)),
+            ["# Title", "Some text\nmore text", "- item"],
+        )
+
+    def test_iter_file_blocks_matches_markdown_to_blocks(self):
+        md = "# Title\r\n\r\nSome **text**\r\nmore\r\n\r\n```\r\ncode\r\n\r\nmore code\r\n```\r\n\r\n"
+        md += "first para\n\u00a0\n- item\n\u3000\x1c\n```x```\u2028\nafter\n\n"
+        md = md * (MMAP_THRESHOLD // len(md) + 2)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "large.md")
+            with open(path, "w", newline="") as f:
+                f.write(md)
+            self.assertGreater(os.path.getsize(path), MMAP_THRESHOLD)
+            blocks = list(iter_file_blocks(path))
+            buffer = io.StringIO()
+            write_blocks_html(iter_file_blocks(path), buffer)
+        self.assertEqual(blocks, markdown_to_blocks(md))
+        self.assertEqual(buffer.getvalue(), markdown_to_html_node(md).to_html())
+
+    def test_iter_file_blocks_empty(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "empty.md")
+            open(path, "w").close()
+            self.assertEqual(list(iter_file_blocks(path)), [])
+
+    def test_write_markdown_html_matches_tree(self):
+        md = "# Title\n\nThis is **bold**\n\n```\ncode\n\nblock\n```\n"
+        buffer = io.StringIO()
+        write_markdown_html(io.StringIO(md), buffer)
+        self.assertEqual(buffer.getvalue(), markdown_to_html_node(md).to_html())
+        self.assertEqual(
+            markdown_to_html_node(io.StringIO(md)).to_html(),
+            markdown_to_html_node(md).to_html(),
+        )
+
 
     def test_paragraph(self):
         md = "This is a paragraph"
@@ -94,6 +168,13 @@ This is the same paragraph on a new line
         result = block_to_block_type(md)
         self.assertEqual(result, BlockType.QUOTE)
 
+    def test_classifies_on_splitlines_boundaries(self):
+        self.assertEqual(block_to_block_type("- a\x0cb"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("- a\x0c- b"), BlockType.UNORDERED_LIST)
+        self.assertEqual(block_to_block_type("> a\u2028b"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("1. a\x852. b"), BlockType.ORDERED_LIST)
+        self.assertEqual(block_to_block_type("1. a\x85b"), BlockType.PARAGRAPH)
+
     def test_unordered_list_multiline(self):
         md = "- Item 1\n- Item 2\n- Item 3"
         result = block_to_block_type(md)
@@ -202,6 +283,115 @@ the **same** even with inline stuff
             html,
             "<div><pre><code>This is text that _should_ remain\nthe **same** even with inline stuff\n</code></pre></div>",
         )
+    def test_classify_block_returns_lines(self):
+        self.assertEqual(
+            classify_block("1. one\n2. two"),
+            (BlockType.ORDERED_LIST, ["1. one", "2. two"]),
+        )
+        self.assertEqual(
+            classify_block("> quote\nnot quote"),
+            (BlockType.PARAGRAPH, ["> quote", "not quote"]),
+        )
+        self.assertEqual(classify_block("1. one\n3. three")[0], BlockType.PARAGRAPH)
+        self.assertEqual(classify_block("- a\n-b")[0], BlockType.PARAGRAPH)
+        self.assertEqual(classify_block("####### too deep")[0], BlockType.PARAGRAPH)
+
+    def test_markdown_to_html_matches_tree(self):
+        md = """
+# Heading with [link](https://boot.dev)
+
+Paragraph with **bold**, _italic_, `code` and ![img](/a.png)
+over two lines
+
+> quoted
+> text
+
+- one
+- _two_
+
+1. first
+2. second
+
+```
+raw **code**
+```
+"""
+        self.assertEqual(markdown_to_html(md), markdown_to_html_node(md).to_html())
+
+    def test_registered_block_type_overrides_direct_renderer(self):
+        original = BLOCK_CONVERTERS[BlockType.CODE]
+        original_renderer = BLOCK_HTML_RENDERERS[BlockType.CODE]
+        register_block_type(BlockType.CODE, lambda block: LeafNode("pre", "hidden"))
+        try:
+            html = markdown_to_html("```\ncode\n```")
+        finally:
+            BLOCK_CONVERTERS[BlockType.CODE] = original
+            BLOCK_HTML_RENDERERS[BlockType.CODE] = original_renderer
+        self.assertEqual(html, "<div><pre>hidden</pre></div>")
+
+    def test_escapes_code_and_text(self):
+        md = "Use `a<b>` & [x](/q?a=1&b=\"2\")\n\n```\nif a < b && c > d:\n```"
+        expected = (
+            "<div><p>Use <code>a&lt;b&gt;</code> &amp; "
+            '<a href="/q?a=1&amp;b=&quot;2&quot;">x</a></p>'
+            "<pre><code>if a &lt; b &amp;&amp; c &gt; d:\n</code></pre></div>"
+        )
+        self.assertEqual(markdown_to_html_node(md).to_html(), expected)
+        self.assertEqual(markdown_to_html(md), expected)
+
+    def test_transformed_leaves_are_escaped_once(self):
+        tree = markdown_to_html_node("Tom & Jerry")
+
+        def visit(node):
+            if node.children is None:
+                return LeafNode(node.tag, node.value + "!", node.props)
+            return node
+
+        self.assertEqual(transform_tree(tree, visit).to_html(), "<div><p>Tom &amp; Jerry!</p></div>")
+
+    def test_inline_parsing_is_lazy(self):
+        node = markdown_to_html_node("# Title\n\nSome **bold** text\n\n- one\n- _two_")
+        heading, paragraph, items = node.children
+        self.assertIsInstance(paragraph, LazyParentNode)
+        self.assertFalse(paragraph.is_parsed())
+        self.assertEqual(outline(node), [(1, "Title")])
+        self.assertEqual(word_count(node), 6)
+        self.assertFalse(heading.is_parsed() or paragraph.is_parsed())
+        self.assertFalse(any(item.is_parsed() for item in items.children))
+        self.assertEqual(
+            node.to_html(),
+            "<div><h1>Title</h1><p>Some <b>bold</b> text</p><ul><li>one</li><li><i>two</i></li></ul></div>",
+        )
+        self.assertTrue(paragraph.is_parsed())
+
+    def test_word_count_ignores_link_and_image_syntax(self):
+        md = "See ![logo](/x.png) the [install guide](/docs/install)now\n\n- [a](/a) b"
+        node = markdown_to_html_node(md)
+        self.assertEqual(word_count(node), 7)
+        node.to_html()
+        leaf_words = sum(
+            len(leaf.value.split())
+            for block in node.children
+            for child in block.children
+            for leaf in (child.children if child.tag == "li" else [child])
+        )
+        self.assertEqual(word_count(node), leaf_words)
+
+    def test_registered_block_type(self):
+        ExtraBlockType = Enum("ExtraBlockType", ["RULE"])
+        register_block_type(
+            ExtraBlockType.RULE,
+            lambda block: LeafNode("hr", ""),
+            lambda block: block == "---",
+        )
+        try:
+            self.assertEqual(block_to_block_type("---"), ExtraBlockType.RULE)
+            html = markdown_to_html_node("above\n\n---\n\nbelow").to_html()
+        finally:
+            del BLOCK_CONVERTERS[ExtraBlockType.RULE]
+            BLOCK_MATCHERS.clear()
+        self.assertEqual(html, "<div><p>above</p><hr></hr><p>below</p></div>")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,73 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from manifest import BuildManifest
+from optimize import minify_css, minify_html, optimize_output
+from static_sync import sync_static
+
+
+class TestMinify(unittest.TestCase):
+    def test_minify_html_collapses_whitespace(self):
+        html = "<html>\n    <body>\n  <!-- nav -->\n    <p>Some   <b>bold</b> text</p>\n  </body>\n</html>\n"
+        self.assertEqual(minify_html(html), "<html>\n<body>\n<p>Some <b>bold</b> text</p>\n</body>\n</html>")
+
+    def test_minify_html_keeps_preformatted(self):
+        html = "<div>\n  <pre><code>def f():\n    return 1\n</code></pre>\n</div>"
+        self.assertEqual(minify_html(html), "<div>\n<pre><code>def f():\n    return 1\n</code></pre>\n</div>")
+
+    def test_minify_css(self):
+        css = '/* main */\nbody {\n  font-family: "Two  Words", serif;\n  margin: 0;\n}\n\nh1,\nh2 > a:hover {\n  color: red;\n}\n'
+        self.assertEqual(
+            minify_css(css),
+            'body{font-family:"Two  Words",serif;margin:0}h1,h2>a:hover{color:red}',
+        )
+
+
+class TestOptimizeOutput(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.public = os.path.join(self.tmp.name, "public")
+        os.mkdir(self.public)
+        self.page = os.path.join(self.public, "index.html")
+        with open(self.page, "w") as f:
+            f.write("<div>\n    <p>hi</p>\n</div>\n")
+        with open(os.path.join(self.public, "logo.png"), "wb") as f:
+            f.write(b"\x89PNG")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_minifies_and_precompresses(self):
+        optimized = optimize_output(self.public, workers=1)
+        self.assertEqual(optimized, [self.page])
+        with open(self.page) as f:
+            self.assertEqual(f.read(), "<div>\n<p>hi</p>\n</div>")
+        with gzip.open(self.page + ".gz", "rt") as f:
+            self.assertEqual(f.read(), "<div>\n<p>hi</p>\n</div>")
+        self.assertFalse(os.path.exists(os.path.join(self.public, "logo.png.gz")))
+
+    def test_skips_unchanged_files(self):
+        manifest = BuildManifest(os.path.join(self.tmp.name, "manifest.json"))
+        self.assertEqual(len(optimize_output(self.public, manifest=manifest, workers=1)), 1)
+        self.assertEqual(optimize_output(self.public, manifest=manifest, workers=1), [])
+        with open(self.page, "w") as f:
+            f.write("<p>changed</p>")
+        self.assertEqual(optimize_output(self.public, manifest=manifest, workers=2), [self.page])
+
+    def test_sync_static_keeps_compressed_siblings(self):
+        static = os.path.join(self.tmp.name, "static")
+        os.mkdir(static)
+        with open(os.path.join(static, "index.css"), "w") as f:
+            f.write("body { margin: 0 }")
+        sync_static(static, self.public, keep={self.page})
+        optimize_output(self.public, workers=1)
+        result = sync_static(static, self.public, keep={self.page}, keep_suffixes=(".gz", ".br"))
+        self.assertEqual(result.removed, [])
+        self.assertTrue(os.path.exists(self.page + ".gz"))
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.css.gz")))
+
+
+if __name__ == "__main__":
+    unittest.main()
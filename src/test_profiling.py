@@ -0,0 +1,55 @@
+import unittest
+from unittest import mock
+
+import profiling
+from profiling import Profiler, input_length, profiled, profiled_iter
+
+
+class TestProfiling(unittest.TestCase):
+    def test_disabled_returns_original_function(self):
+        def render(text):
+            return text
+
+        with mock.patch.object(profiling, "ENABLED", False):
+            self.assertIs(profiled("stage")(render), render)
+
+    def test_records_outermost_calls_and_pages(self):
+        profiler = Profiler()
+
+        def countdown(text):
+            return countdown(text[1:]) if text else "done"
+
+        with mock.patch.object(profiling, "ENABLED", True), mock.patch.object(
+            profiling, "profiler", profiler
+        ):
+            countdown = profiled("countdown", input_length, page=True)(countdown)
+            countdown("abc")
+            countdown("de")
+
+        self.assertEqual(profiler.stages["countdown"][0], 2)
+        self.assertEqual(profiler.stages["countdown"][2], 5)
+        self.assertEqual([page[0] for page in profiler.pages], ["abc", "de"])
+        trace = profiler.trace(top=1)
+        self.assertEqual(trace["pages"], 2)
+        self.assertEqual(len(trace["slowest_pages"]), 1)
+        self.assertIn("countdown", profiler.summary())
+
+    def test_profiled_iter_records_time_inside_the_generator(self):
+        profiler = Profiler()
+
+        def letters(text):
+            yield from text
+
+        with mock.patch.object(profiling, "ENABLED", True), mock.patch.object(
+            profiling, "profiler", profiler
+        ):
+            letters = profiled_iter("letters", input_length)(letters)
+            self.assertEqual(list(letters("abc")), ["a", "b", "c"])
+            next(letters("de"))
+
+        self.assertEqual(profiler.stages["letters"][0], 2)
+        self.assertEqual(profiler.stages["letters"][2], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import io
+import unittest
+
+from progress import INFO, QUIET, VERBOSE, ProgressReporter
+
+
+class TestProgressReporter(unittest.TestCase):
+    def test_info_aggregates_without_per_file_lines(self):
+        stream = io.StringIO()
+        reporter = ProgressReporter(INFO, stream, interval=3600)
+        for index in range(1000):
+            reporter.event("files copied", f"Copied file: {index}")
+        reporter.add("files unchanged", 5)
+        reporter.summary("Build")
+        output = stream.getvalue()
+        self.assertNotIn("Copied file", output)
+        self.assertTrue(output.startswith("Build: 1000 files copied, 5 files unchanged in "))
+
+    def test_verbose_prints_each_event(self):
+        stream = io.StringIO()
+        reporter = ProgressReporter(VERBOSE, stream)
+        reporter.event("files copied", "Copied file: a")
+        reporter.detail("Finished copying directory: static")
+        self.assertEqual(
+            stream.getvalue(), "Copied file: a\nFinished copying directory: static\n"
+        )
+
+    def test_quiet_prints_nothing(self):
+        stream = io.StringIO()
+        reporter = ProgressReporter(QUIET, stream, interval=0)
+        for index in range(300):
+            reporter.event("files copied", f"Copied file: {index}")
+        reporter.info("Block cache")
+        reporter.summary("Build")
+        self.assertEqual(stream.getvalue(), "")
+        self.assertEqual(reporter.counts["files copied"], 300)
+
+    def test_periodic_progress_line(self):
+        stream = io.StringIO()
+        reporter = ProgressReporter(INFO, stream, interval=0)
+        for index in range(256):
+            reporter.event("pages rendered")
+        self.assertTrue(stream.getvalue().startswith("... 256 pages rendered"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import io
+import os
+import tempfile
+import unittest
+
+from depgraph import DependencyGraph
+from manifest import BuildManifest
+from progress import INFO, ProgressReporter
+from render_pages import find_markdown_files, output_path_for, render_directory, render_page
+
+
+class TestRenderPages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.public = os.path.join(self.tmp.name, "public")
+        os.makedirs(os.path.join(self.content, "blog"))
+        pages = {
+            "index.md": "# Home\n\nWelcome **home**",
+            "blog/b.md": "# B\n\n- one\n- two",
+            "blog/a.md": "# A\n\n> quoted",
+        }
+        for name, markdown in pages.items():
+            with open(os.path.join(self.content, name), "w") as f:
+                f.write(markdown)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_output(self, name):
+        with open(os.path.join(self.public, name)) as f:
+            return f.read()
+
+    def test_find_markdown_files_sorted(self):
+        self.assertEqual(
+            find_markdown_files(self.content),
+            [
+                os.path.join(self.content, "index.md"),
+                os.path.join(self.content, "blog", "a.md"),
+                os.path.join(self.content, "blog", "b.md"),
+            ],
+        )
+
+    def test_output_path_for(self):
+        source = os.path.join(self.content, "blog", "a.md")
+        self.assertEqual(
+            output_path_for(source, self.content, self.public),
+            os.path.join(self.public, "blog", "a.html"),
+        )
+
+    def test_render_directory_serial_and_parallel_match(self):
+        render_directory(self.content, self.public, workers=1)
+        serial = [self.read_output(name) for name in ("index.html", "blog/a.html", "blog/b.html")]
+        render_directory(self.content, self.public, workers=2, chunksize=1)
+        parallel = [self.read_output(name) for name in ("index.html", "blog/a.html", "blog/b.html")]
+        self.assertEqual(serial, parallel)
+        self.assertEqual(
+            serial[0], "<div><h1>Home</h1><p>Welcome <b>home</b></p></div>"
+        )
+
+    def test_render_directory_with_template(self):
+        template_path = os.path.join(self.tmp.name, "template.html")
+        with open(template_path, "w") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+        manifest = BuildManifest(os.path.join(self.tmp.name, "manifest.json"))
+        render_directory(self.content, self.public, 1, manifest=manifest, template_path=template_path)
+        self.assertEqual(
+            self.read_output("blog/a.html"),
+            "<title>A</title><div><h1>A</h1><blockquote>quoted</blockquote></div>",
+        )
+        with open(template_path, "w") as f:
+            f.write("<title>{{ Title }}!</title>{{ Content }}")
+        rendered = render_directory(
+            self.content, self.public, 1, manifest=manifest, template_path=template_path
+        )
+        self.assertEqual(len(rendered), 3)
+
+    def test_render_directory_skips_fresh_pages(self):
+        manifest = BuildManifest(os.path.join(self.tmp.name, "manifest.json"))
+        self.assertEqual(len(render_directory(self.content, self.public, 1, manifest=manifest)), 3)
+        self.assertEqual(render_directory(self.content, self.public, 1, manifest=manifest), [])
+
+    def test_render_directory_records_graph(self):
+        with open(os.path.join(self.content, "blog/a.md"), "a") as f:
+            f.write("\n\n![diagram](diagram.png)")
+        graph = DependencyGraph()
+        static = os.path.join(self.tmp.name, "static")
+        render_directory(self.content, self.public, 2, graph=graph, static_dir=static)
+        self.assertEqual(
+            graph.affected_outputs({os.path.join(static, "blog/diagram.png")}),
+            {os.path.join(self.public, "blog/a.html")},
+        )
+        self.assertEqual(len(graph.affected_outputs({os.path.join(self.content, "index.md")})), 1)
+
+    def test_render_directory_reports_cache_stats_from_workers(self):
+        cache_path = os.path.join(self.tmp.name, "blocks.sqlite")
+        for workers in (2, 1):
+            stream = io.StringIO()
+            render_directory(
+                self.content,
+                self.public,
+                workers,
+                chunksize=1,
+                cache_path=cache_path,
+                reporter=ProgressReporter(INFO, stream),
+            )
+            self.assertIn("Block cache: {", stream.getvalue())
+        # Six blocks across three pages: all misses first, all disk hits on the rebuild.
+        self.assertIn("'disk_hits': 6, 'misses': 0", stream.getvalue())
+
+    def test_render_page_keeps_previous_output_on_error(self):
+        template_path = os.path.join(self.tmp.name, "template.html")
+        with open(template_path, "w") as f:
+            f.write("{{ Content }}")
+        source = os.path.join(self.content, "index.md")
+        output = os.path.join(self.tmp.name, "index.html")
+        size, assets, _ = render_page(source, output, template_path)
+        self.assertEqual(size, os.path.getsize(output))
+        self.assertEqual(assets, [])
+        with open(source, "w") as f:
+            f.write("no title here")
+        with self.assertRaises(ValueError):
+            render_page(source, output, template_path)
+        with open(output) as f:
+            self.assertIn("<h1>Home</h1>", f.read())
+        self.assertFalse(os.path.exists(output + ".tmp"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import contextlib
+import io
+import os
+import tempfile
+import time
+import unittest
+
+from depgraph import DependencyGraph
+from serve import PollingWatcher, collect_changes, make_watcher, rebuild_changed
+
+
+class TestRebuildChanged(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.static = os.path.join(self.tmp.name, "static")
+        self.public = os.path.join(self.tmp.name, "public")
+        for path in (self.content, self.static, self.public):
+            os.mkdir(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, content):
+        with open(path, "w") as f:
+            f.write(content)
+
+    def test_renders_changed_page_only(self):
+        page = os.path.join(self.content, "index.md")
+        self.write(page, "# Hello")
+        self.write(os.path.join(self.content, "other.md"), "# Other")
+        rebuilt = rebuild_changed({page}, self.content, self.static, self.public)
+        self.assertEqual(rebuilt, [os.path.join(self.public, "index.html")])
+        self.assertFalse(os.path.exists(os.path.join(self.public, "other.html")))
+        with open(rebuilt[0]) as f:
+            self.assertEqual(f.read(), "<div><h1>Hello</h1></div>")
+
+    def test_invalid_page_keeps_last_good_output(self):
+        page = os.path.join(self.content, "index.md")
+        other = os.path.join(self.content, "other.md")
+        self.write(page, "# Hello")
+        rebuild_changed({page}, self.content, self.static, self.public)
+        self.write(page, "# Hello\n\nhalf-typed **bold")
+        self.write(other, "# Other")
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            rebuilt = rebuild_changed({page, other}, self.content, self.static, self.public)
+        self.assertEqual(rebuilt, [os.path.join(self.public, "other.html")])
+        self.assertIn(f"Failed to rebuild {page}", stdout.getvalue())
+        with open(os.path.join(self.public, "index.html")) as f:
+            self.assertEqual(f.read(), "<div><h1>Hello</h1></div>")
+        self.assertFalse(os.path.exists(os.path.join(self.public, "index.html.tmp")))
+
+    def test_copies_and_removes_static(self):
+        asset = os.path.join(self.static, "index.css")
+        self.write(asset, "body {}")
+        rebuild_changed({asset}, self.content, self.static, self.public)
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.css")))
+        os.remove(asset)
+        rebuild_changed({asset}, self.content, self.static, self.public)
+        self.assertFalse(os.path.exists(os.path.join(self.public, "index.css")))
+
+    def test_deleted_static_dir_keeps_rendered_pages(self):
+        os.mkdir(os.path.join(self.static, "blog"))
+        os.mkdir(os.path.join(self.content, "blog"))
+        figure = os.path.join(self.static, "blog", "fig.png")
+        post = os.path.join(self.content, "blog", "post.md")
+        self.write(figure, "png")
+        self.write(post, "# Post")
+        rebuild_changed({figure, post}, self.content, self.static, self.public)
+        os.remove(figure)
+        os.rmdir(os.path.join(self.static, "blog"))
+        rebuild_changed(
+            {figure, os.path.join(self.static, "blog")}, self.content, self.static, self.public
+        )
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog", "fig.png")))
+        self.assertTrue(os.path.exists(os.path.join(self.public, "blog", "post.html")))
+
+    def test_deleted_static_dir_is_removed_once_empty(self):
+        os.makedirs(os.path.join(self.static, "img", "icons"))
+        icon = os.path.join(self.static, "img", "icons", "a.svg")
+        self.write(icon, "<svg/>")
+        rebuild_changed({icon}, self.content, self.static, self.public)
+        os.remove(icon)
+        os.removedirs(os.path.join(self.static, "img", "icons"))
+        os.mkdir(self.static)
+        rebuild_changed(
+            {icon, os.path.join(self.static, "img")}, self.content, self.static, self.public
+        )
+        self.assertEqual(os.listdir(self.public), [])
+
+    def test_graph_rebuilds_only_pages_using_asset(self):
+        graph = DependencyGraph()
+        logo = os.path.join(self.static, "logo.png")
+        self.write(logo, "png")
+        uses_logo = os.path.join(self.content, "index.md")
+        self.write(uses_logo, "# Hello\n\n![logo](/logo.png)")
+        other = os.path.join(self.content, "other.md")
+        self.write(other, "# Other")
+        rebuild_changed({uses_logo, other}, self.content, self.static, self.public, graph=graph)
+        rebuilt = rebuild_changed({logo}, self.content, self.static, self.public, graph=graph)
+        self.assertEqual(
+            rebuilt,
+            [os.path.join(self.public, "index.html"), os.path.join(self.public, "logo.png")],
+        )
+
+    def test_watchers_report_changes(self):
+        for watcher in (make_watcher([self.content]), PollingWatcher([self.content], 0.01)):
+            page = os.path.join(self.content, f"{type(watcher).__name__}.md")
+            time.sleep(0.01)
+            self.write(page, "# Changed")
+            self.assertIn(page, collect_changes(watcher, 0.05))
+            watcher.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+from static_sync import sync_static
+
+
+class TestStaticSync(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.public = os.path.join(self.tmp.name, "public")
+        os.makedirs(os.path.join(self.static, "images", "icons"))
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(os.path.join(self.static, "images", "icons", "a.svg"), "<svg/>")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, content):
+        with open(path, "w") as f:
+            f.write(content)
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_copies_tree(self):
+        result = sync_static(self.static, self.public)
+        self.assertEqual(len(result.copied), 2)
+        self.assertEqual(self.read(os.path.join(self.public, "images", "icons", "a.svg")), "<svg/>")
+
+    def test_skips_unchanged_and_copies_changed(self):
+        sync_static(self.static, self.public)
+        self.write(os.path.join(self.static, "index.css"), "body { margin: 0 }")
+        result = sync_static(self.static, self.public)
+        self.assertEqual(result.copied, [os.path.join(self.public, "index.css")])
+        self.assertEqual(result.skipped, 1)
+        self.assertEqual(self.read(os.path.join(self.public, "index.css")), "body { margin: 0 }")
+
+    def test_removes_stale_outputs_but_keeps_listed(self):
+        sync_static(self.static, self.public)
+        os.makedirs(os.path.join(self.public, "old"))
+        stale = os.path.join(self.public, "old", "gone.png")
+        page = os.path.join(self.public, "index.html")
+        self.write(stale, "x")
+        self.write(page, "<div></div>")
+        result = sync_static(self.static, self.public, keep={page})
+        self.assertIn(stale, result.removed)
+        self.assertFalse(os.path.exists(os.path.join(self.public, "old")))
+        self.assertTrue(os.path.exists(page))
+
+    def test_transforms_while_copying(self):
+        transforms = {".css": str.upper}
+        result = sync_static(self.static, self.public, transforms=transforms)
+        self.assertEqual(len(result.copied), 2)
+        self.assertEqual(self.read(os.path.join(self.public, "index.css")), "BODY {}")
+        result = sync_static(self.static, self.public, transforms=transforms)
+        self.assertEqual(result.copied, [])
+
+    def test_hardlink_mode(self):
+        sync_static(self.static, self.public, mode="hardlink")
+        self.assertTrue(
+            os.path.samefile(
+                os.path.join(self.static, "index.css"),
+                os.path.join(self.public, "index.css"),
+            )
+        )
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            sync_static(self.static, self.public, mode="rsync")
+
+
+if __name__ == "__main__":
+    unittest.main()
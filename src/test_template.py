@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+
+from template import Template, load_template, template_dependencies
+
+
+class TestTemplate(unittest.TestCase):
+    def test_render_fields(self):
+        template = Template("<title>{{ Title }}</title><main>{{Content}}</main>{{ Title }}")
+        self.assertEqual(template.fields, {"Title", "Content"})
+        self.assertEqual(
+            template.render({"Title": "Home", "Content": "<p>hi</p>"}),
+            "<title>Home</title><main><p>hi</p></main>Home",
+        )
+
+    def test_render_does_not_expand_placeholders_in_values(self):
+        template = Template("{{ Content }}|{{ Author }}")
+        self.assertEqual(
+            template.render({"Content": "{{ Author }}", "Author": "Ada"}),
+            "{{ Author }}|Ada",
+        )
+
+    def test_missing_field(self):
+        with self.assertRaises(ValueError):
+            Template("{{ Title }}").render({})
+
+    def test_load_template_reloads_on_change(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "template.html")
+            with open(path, "w") as f:
+                f.write("<h1>{{ Title }}</h1>")
+            first = load_template(path)
+            self.assertIs(load_template(path), first)
+            with open(path, "w") as f:
+                f.write("<h2>{{ Title }}</h2>")
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            self.assertEqual(load_template(path).render({"Title": "x"}), "<h2>x</h2>")
+
+    def test_partials_are_included_and_tracked(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "template.html")
+            partial = os.path.join(tmp, "partials", "header.html")
+            os.mkdir(os.path.dirname(partial))
+            with open(path, "w") as f:
+                f.write("{{> partials/header.html }}<main>{{ Content }}</main>")
+            with open(partial, "w") as f:
+                f.write("<h1>{{ Title }}</h1>")
+            template = load_template(path)
+            self.assertEqual(template_dependencies(path), [path, partial])
+            self.assertEqual(
+                template.render({"Title": "T", "Content": "c"}), "<h1>T</h1><main>c</main>"
+            )
+            with open(partial, "w") as f:
+                f.write("<h2>{{ Title }}</h2>")
+            stat = os.stat(partial)
+            os.utime(partial, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            self.assertEqual(
+                load_template(path).render({"Title": "T", "Content": "c"}),
+                "<h2>T</h2><main>c</main>",
+            )
+
+    def test_recursive_partial(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "loop.html")
+            with open(path, "w") as f:
+                f.write("{{> loop.html }}")
+            with self.assertRaises(ValueError):
+                load_template(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,14 @@
 import unittest
+from enum import Enum
 
-from textnode import TextNode, TextType, text_node_to_html_node
+from textnode import (
+    TEXT_NODE_CONVERTERS,
+    TextNode,
+    TextType,
+    register_text_type,
+    text_node_to_html_node,
+)
+from htmlnode import LeafNode
 
 
 class TestTextNode(unittest.TestCase):
@@ -30,6 +38,10 @@ class TestTextNode(unittest.TestCase):
             "TextNode(This is a text node, text, https://www.boot.dev)", repr(node)
         )
 
+    def test_no_instance_dict(self):
+        node = TextNode("This is a text node", TextType.TEXT)
+        self.assertFalse(hasattr(node, "__dict__"))
+
 
 class TestTextNodeToHTMLNode(unittest.TestCase):
     def test_text(self):
@@ -66,6 +78,28 @@ class TestTextNodeToHTMLNode(unittest.TestCase):
         self.assertEqual(html_node.tag, "b")
         self.assertEqual(html_node.value, "This is bold")
 
+    def test_link(self):
+        node = TextNode("click", TextType.LINK, "https://www.boot.dev")
+        html_node = text_node_to_html_node(node)
+        self.assertEqual(html_node.to_html(), '<a href="https://www.boot.dev">click</a>')
+
+    def test_leaves_keep_raw_text(self):
+        html_node = text_node_to_html_node(TextNode("a < b & c", TextType.CODE))
+        self.assertEqual(html_node.value, "a < b & c")
+        self.assertEqual(html_node.to_html(), "<code>a &lt; b &amp; c</code>")
+        self.assertEqual(html_node.to_html(), "<code>a &lt; b &amp; c</code>")
+        html_node.value = "x > y"
+        self.assertEqual(html_node.to_html(), "<code>x &gt; y</code>")
+
+    def test_registered_text_type(self):
+        ExtraType = Enum("ExtraType", ["STRIKE"])
+        register_text_type(ExtraType.STRIKE, lambda node: LeafNode("s", node.text))
+        try:
+            html_node = text_node_to_html_node(TextNode("gone", ExtraType.STRIKE))
+        finally:
+            del TEXT_NODE_CONVERTERS[ExtraType.STRIKE]
+        self.assertEqual(html_node.to_html(), "<s>gone</s>")
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,4 +1,5 @@
-from htmlnode import LeafNode
+from htmlnode import LeafNode, escape_attribute, escape_text
+from profiling import profiled
 from enum import Enum
 
 
@@ -12,6 +13,8 @@ class TextType(Enum):
 
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url=None):
         self.text = text
         self.text_type = text_type
@@ -28,17 +31,90 @@ class TextNode:
         return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
 
 
+def text_to_leaf(text_node):
+    return LeafNode(None, text_node.text)
+
+
+def bold_to_leaf(text_node):
+    return LeafNode("b", text_node.text)
+
+
+def italic_to_leaf(text_node):
+    return LeafNode("i", text_node.text)
+
+
+def code_to_leaf(text_node):
+    return LeafNode("code", text_node.text)
+
+
+def link_to_leaf(text_node):
+    return LeafNode("a", text_node.text, {"href": text_node.url})
+
+
+def image_to_leaf(text_node):
+    return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
+
+
+TEXT_NODE_CONVERTERS = {
+    TextType.TEXT: text_to_leaf,
+    TextType.BOLD: bold_to_leaf,
+    TextType.ITALIC: italic_to_leaf,
+    TextType.CODE: code_to_leaf,
+    TextType.LINK: link_to_leaf,
+    TextType.IMAGE: image_to_leaf,
+}
+
+
+def register_text_type(text_type, converter):
+    TEXT_NODE_CONVERTERS[text_type] = converter
+    TEXT_NODE_HTML_RENDERERS.pop(text_type, None)
+
+
+@profiled("html_nodes")
 def text_node_to_html_node(text_node):
-    if text_node.text_type == TextType.TEXT:
-        return LeafNode(None, text_node.text)
-    if text_node.text_type == TextType.BOLD:
-        return LeafNode("b", text_node.text)
-    if text_node.text_type == TextType.ITALIC:
-        return LeafNode("i", text_node.text)
-    if text_node.text_type == TextType.CODE:
-        return LeafNode("code", text_node.text)
-    if text_node.text_type == TextType.LINK:
-        return LeafNode("a", text_node.text, {"href": text_node.url})
-    if text_node.text_type == TextType.IMAGE:
-        return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
-    raise ValueError(f"invalid text type: {text_node.text_type}")
+    converter = TEXT_NODE_CONVERTERS.get(text_node.text_type)
+    if converter is None:
+        raise ValueError(f"invalid text type: {text_node.text_type}")
+    return converter(text_node)
+
+
+def plain_html(text_node):
+    return escape_text(text_node.text)
+
+
+def bold_html(text_node):
+    return f"<b>{escape_text(text_node.text)}</b>"
+
+
+def italic_html(text_node):
+    return f"<i>{escape_text(text_node.text)}</i>"
+
+
+def code_html(text_node):
+    return f"<code>{escape_text(text_node.text)}</code>"
+
+
+def link_html(text_node):
+    return f'<a href="{escape_attribute(text_node.url)}">{escape_text(text_node.text)}</a>'
+
+
+def image_html(text_node):
+    return f'<img src="{escape_attribute(text_node.url)}" alt="{escape_attribute(text_node.text)}"></img>'
+
+
+TEXT_NODE_HTML_RENDERERS = {
+    TextType.TEXT: plain_html,
+    TextType.BOLD: bold_html,
+    TextType.ITALIC: italic_html,
+    TextType.CODE: code_html,
+    TextType.LINK: link_html,
+    TextType.IMAGE: image_html,
+}
+
+
+@profiled("html_nodes")
+def text_node_to_html(text_node):
+    renderer = TEXT_NODE_HTML_RENDERERS.get(text_node.text_type)
+    if renderer is not None:
+        return renderer(text_node)
+    return text_node_to_html_node(text_node).to_html()